@@ -1,14 +1,113 @@
 # backend/data_processor.py
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import json
+import multiprocessing
+import orjson
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from hashlib import blake2b
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
 from datasets import Dataset
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared by the per-record helpers and the vectorized pandas cleaning path
+WHITESPACE_RE = re.compile(r'\s+')
+URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+EXCLAMATION_RE = re.compile(r'!{3,}')
+QUESTION_RE = re.compile(r'\?{3,}')
+NEWS_INDICATORS = (
+    'said', 'reported', 'according', 'news', 'breaking',
+    'president', 'government', 'police', 'court', 'official'
+)
+NEWS_INDICATOR_PATTERN = '|'.join(re.escape(indicator) for indicator in NEWS_INDICATORS)
+NEWS_INDICATOR_RE = re.compile(NEWS_INDICATOR_PATTERN, re.IGNORECASE)
+
+# Below this size process start-up costs more than parsing the file serially
+PARALLEL_JSONL_MIN_BYTES = 8 * 1024 * 1024
+
+# Headlines repeat across datasets and loaders, so the per-record text
+# helpers are memoized on the text itself
+@lru_cache(maxsize=200_000)
+def _clean_text(text: str) -> str:
+    # Remove extra whitespace and normalize
+    text = WHITESPACE_RE.sub(' ', text.strip())
+    
+    # Remove URLs but keep the context (most titles have none, so skip the regex)
+    if 'http' in text:
+        text = URL_RE.sub('[URL]', text)
+    
+    # Remove excessive punctuation
+    text = EXCLAMATION_RE.sub('!!!', text)
+    text = QUESTION_RE.sub('???', text)
+    
+    return text.strip()
+
+@lru_cache(maxsize=200_000)
+def _is_valid_news_text(text: str) -> bool:
+    text = text.strip()
+    if len(text) < 10:
+        return False
+        
+    # Must have some structure; clean_text collapses whitespace to single
+    # spaces, so counting them avoids building a word list
+    word_count = text.count(' ') + 1
+    if word_count < 3:
+        return False
+        
+    # Should contain some news-like indicators
+    if NEWS_INDICATOR_RE.search(text):
+        return True
+    
+    # Otherwise require proper sentence structure
+    return '.' in text and word_count > 5
+
+# Loader results keyed by (loader, data_dir, args), stored with the file
+# fingerprint they were built from
+_loader_cache: Dict[tuple, tuple] = {}
+
+def _files_fingerprint(paths: List[Path]) -> tuple:
+    """(path, mtime_ns, size) for each watched file, or each file in a watched directory"""
+    entries = []
+    for path in paths:
+        if path.is_dir():
+            candidates = sorted(path.iterdir())
+        elif path.exists():
+            candidates = [path]
+        else:
+            continue
+        for candidate in candidates:
+            if candidate.is_file():
+                stat = candidate.stat()
+                entries.append((str(candidate), stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+def _cached_until_modified(watched_paths: Callable[..., List[Path]]):
+    """Cache a loader's result until any of its watched files change on disk"""
+    def decorator(loader):
+        @wraps(loader)
+        def wrapper(self, *args, **kwargs):
+            key = (loader.__name__, str(self.data_dir.resolve()), args, tuple(sorted(kwargs.items())))
+            fingerprint = _files_fingerprint(watched_paths(self, *args, **kwargs))
+            
+            cached = _loader_cache.get(key)
+            if cached and cached[0] == fingerprint:
+                return list(cached[1])
+            
+            result = loader(self, *args, **kwargs)
+            _loader_cache[key] = (fingerprint, result)
+            return list(result)
+        return wrapper
+    return decorator
+
 class NewsDataProcessor:
     """Enhanced data processor for multiple fake news datasets"""
     
@@ -20,42 +119,41 @@ class NewsDataProcessor:
         """Clean and normalize text data"""
         if not text or pd.isna(text):
             return ""
-        
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Remove URLs but keep the context
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', 
-                     '[URL]', text)
-        
-        # Remove excessive punctuation
-        text = re.sub(r'[!]{3,}', '!!!', text)
-        text = re.sub(r'[?]{3,}', '???', text)
-        
-        return text.strip()
+        return _clean_text(text)
     
     def is_valid_news_text(self, text: str) -> bool:
-        """Check if text appears to be valid news content"""
-        if not text or len(text.strip()) < 10:
+        """Check if text appears to be valid news content (expects clean_text output)"""
+        if not text:
             return False
-            
-        # Must have some structure
-        words = text.split()
-        if len(words) < 3:
-            return False
-            
-        # Should contain some news-like indicators
-        news_indicators = [
-            'said', 'reported', 'according', 'news', 'breaking',
-            'president', 'government', 'police', 'court', 'official'
-        ]
-        
-        text_lower = text.lower()
-        indicator_count = sum(1 for indicator in news_indicators if indicator in text_lower)
-        
-        # At least one news indicator or proper sentence structure
-        return indicator_count > 0 or (text.count('.') > 0 and len(words) > 5)
+        return _is_valid_news_text(text)
+    
+    def clean_text_series(self, texts: pd.Series) -> pd.Series:
+        """Vectorized equivalent of clean_text for a whole column"""
+        texts = texts.fillna('').astype(str).str.strip()
+        texts = texts.str.replace(WHITESPACE_RE, ' ', regex=True)
+        texts = texts.str.replace(URL_RE, '[URL]', regex=True)
+        texts = texts.str.replace(EXCLAMATION_RE, '!!!', regex=True)
+        texts = texts.str.replace(QUESTION_RE, '???', regex=True)
+        return texts.str.strip()
+    
+    def valid_news_mask(self, texts: pa.StringArray) -> pa.BooleanArray:
+        """Vectorized equivalent of is_valid_news_text using Arrow compute kernels"""
+        word_counts = pc.list_value_length(pc.utf8_split_whitespace(texts))
+        has_indicator = pc.match_substring_regex(texts, NEWS_INDICATOR_PATTERN, ignore_case=True)
+        has_sentence = pc.and_(pc.match_substring(texts, '.'), pc.greater(word_counts, 5))
+        return pc.and_(
+            pc.and_(pc.greater_equal(pc.utf8_length(texts), 10), pc.greater_equal(word_counts, 3)),
+            pc.or_(has_indicator, has_sentence)
+        )
+    
+    def custom_jsonl_path(self, file_path: str = "training_data.jsonl") -> Path:
+        """Resolve custom JSONL data, checking backend/data before data_dir"""
+        backend_data_path = Path(__file__).parent / "data" / file_path
+        if backend_data_path.exists():
+            return backend_data_path
+        return self.data_dir / file_path
     
+    @_cached_until_modified(lambda self: [self.data_dir / "fakenewsnet"])
     def load_fakenewsnet_data(self) -> List[Dict]:
         """Load FakeNewsNet dataset (Politifact + GossipCop)"""
         datasets = []
@@ -72,78 +170,99 @@ class NewsDataProcessor:
             full_path = self.data_dir / file_path
             if full_path.exists():
                 try:
-                    df = pd.read_csv(full_path)
+                    # Only the title column is used, so skip parsing everything else
+                    df = pd.read_csv(
+                        full_path,
+                        usecols=lambda column: column == 'title',
+                        dtype={'title': 'string'},
+                        na_filter=False
+                    )
                     logger.info(f"Loading {len(df)} samples from {file_path}")
                     
-                    for _, row in df.iterrows():
-                        title = self.clean_text(str(row.get('title', '')))
-                        if self.is_valid_news_text(title):
-                            datasets.append({
-                                'text': title,
-                                'label': label,
-                                'source': 'fakenewsnet',
-                                'dataset': file_path.split('/')[1].replace('.csv', '')
-                            })
+                    if 'title' not in df.columns:
+                        continue
+                    
+                    titles = pa.array(self.clean_text_series(df['title']), type=pa.string())
+                    valid_titles = titles.filter(self.valid_news_mask(titles)).to_pylist()
+                    dataset_name = file_path.split('/')[1].replace('.csv', '')
+                    
+                    datasets.extend({
+                        'text': title,
+                        'label': label,
+                        'source': 'fakenewsnet',
+                        'dataset': dataset_name
+                    } for title in valid_titles)
                 except Exception as e:
                     logger.warning(f"Failed to load {file_path}: {e}")
                     
         return datasets
     
+    @_cached_until_modified(lambda self, file_path="training_data.jsonl": [self.custom_jsonl_path(file_path)])
     def load_custom_jsonl_data(self, file_path: str = "training_data.jsonl") -> List[Dict]:
         """Load custom JSONL training data"""
         datasets = []
-        # Check backend/data first, then fall back to data_dir
-        backend_data_path = Path(__file__).parent / "data" / file_path
-        if backend_data_path.exists():
-            full_path = backend_data_path
-        else:
-            full_path = self.data_dir / file_path
+        full_path = self.custom_jsonl_path(file_path)
         
         if not full_path.exists():
             logger.info(f"No custom training data found at {full_path}")
             return datasets
             
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        record = json.loads(line.strip())
-                        text = self.clean_text(str(record.get('text', '')))
-                        
-                        # Handle different record formats
-                        label = None
-                        if 'label' in record:
-                            # Simple format: {"text": "...", "label": "REAL"}
-                            label = str(record.get('label', '')).upper()
-                        elif 'analysis_result' in record:
-                            # Complex format from analysis results
-                            ml_result = record.get('analysis_result', {}).get('ml_fake_news_check', {})
-                            if ml_result:
-                                label = str(ml_result.get('label', '')).upper()
-                        elif 'ml_prediction' in record:
-                            # Alternative format with direct ml_prediction
-                            label = str(record.get('ml_prediction', '')).upper()
-                        
-                        # Clean up label variations
-                        if label in ['FAKE (OVERRIDDEN)', 'FAKE (OVERRIDE)']:
-                            label = 'FAKE'
-                        
-                        if text and label in ['FAKE', 'REAL'] and self.is_valid_news_text(text):
-                            datasets.append({
-                                'text': text,
-                                'label': label,
-                                'source': 'custom',
-                                'dataset': 'training_data'
-                            })
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid JSON at line {line_num} in {file_path}")
-                        continue
+            file_size = full_path.stat().st_size
+            workers = os.cpu_count() or 1
+            if file_size < PARALLEL_JSONL_MIN_BYTES or workers < 2:
+                datasets.extend(_load_custom_jsonl_shard(str(full_path), 0, file_size))
+                return datasets
+            
+            # JSONL lines are independent, so shard the file by byte offset
+            # and let each worker realign to the next line boundary
+            bounds = [file_size * i // workers for i in range(workers + 1)]
+            # Spawn rather than fork: this runs on a worker thread of the API server,
+            # and forking a process that already runs torch/tokenizer threads can deadlock
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                shards = executor.map(_load_custom_jsonl_shard,
+                                      repeat(str(full_path)), bounds[:-1], bounds[1:])
+                for shard in shards:
+                    datasets.extend(shard)
                         
         except Exception as e:
             logger.error(f"Failed to load custom data: {e}")
             
         return datasets
     
+    def parse_custom_record(self, record: Dict) -> Optional[Dict]:
+        """Normalize a custom JSONL record, returning None if it is not usable"""
+        text = self.clean_text(str(record.get('text', '')))
+        
+        # Handle different record formats
+        label = None
+        if 'label' in record:
+            # Simple format: {"text": "...", "label": "REAL"}
+            label = str(record.get('label', '')).upper()
+        elif 'analysis_result' in record:
+            # Complex format from analysis results
+            ml_result = record.get('analysis_result', {}).get('ml_fake_news_check', {})
+            if ml_result:
+                label = str(ml_result.get('label', '')).upper()
+        elif 'ml_prediction' in record:
+            # Alternative format with direct ml_prediction
+            label = str(record.get('ml_prediction', '')).upper()
+        
+        # Clean up label variations
+        if label in ['FAKE (OVERRIDDEN)', 'FAKE (OVERRIDE)']:
+            label = 'FAKE'
+        
+        if text and label in ['FAKE', 'REAL'] and self.is_valid_news_text(text):
+            return {
+                'text': text,
+                'label': label,
+                'source': 'custom',
+                'dataset': 'training_data'
+            }
+        return None
+    
+    @_cached_until_modified(lambda self: [self.data_dir / "pheme"])
     def load_pheme_data(self) -> List[Dict]:
         """Load PHEME dataset if available"""
         datasets = []
@@ -184,81 +303,128 @@ class NewsDataProcessor:
                 
         return datasets
     
-    def balance_dataset(self, datasets: List[Dict], max_per_class: Optional[int] = None) -> List[Dict]:
-        """Balance the dataset to have equal FAKE/REAL samples"""
-        fake_samples = [d for d in datasets if d['label'] == 'FAKE']
-        real_samples = [d for d in datasets if d['label'] == 'REAL']
+    def balanced_indices(self, labels: np.ndarray, max_per_class: Optional[int] = None) -> np.ndarray:
+        """Indices selecting an equal number of FAKE and REAL entries from a label array"""
+        fake_idx = np.flatnonzero(labels == 'FAKE')
+        real_idx = np.flatnonzero(labels == 'REAL')
         
-        logger.info(f"Before balancing: {len(fake_samples)} FAKE, {len(real_samples)} REAL")
+        logger.info(f"Before balancing: {len(fake_idx)} FAKE, {len(real_idx)} REAL")
         
         # Determine target size
         if max_per_class:
-            target_size = min(max_per_class, len(fake_samples), len(real_samples))
+            target_size = min(max_per_class, len(fake_idx), len(real_idx))
         else:
-            target_size = min(len(fake_samples), len(real_samples))
+            target_size = min(len(fake_idx), len(real_idx))
             
         if target_size < 10:
             logger.warning(f"Very small dataset size: {target_size} samples per class")
             
-        # Sample equally from each class
-        balanced_data = fake_samples[:target_size] + real_samples[:target_size]
+        logger.info(f"After balancing: {target_size} samples per class, {2 * target_size} total")
         
-        logger.info(f"After balancing: {target_size} samples per class, {len(balanced_data)} total")
-        return balanced_data
+        # Sample equally from each class
+        return np.concatenate([fake_idx[:target_size], real_idx[:target_size]])
+    
+    def balance_dataset(self, datasets: List[Dict], max_per_class: Optional[int] = None) -> List[Dict]:
+        """Balance the dataset to have equal FAKE/REAL samples"""
+        labels = np.array([d['label'] for d in datasets], dtype=object)
+        selected = self.balanced_indices(labels, max_per_class)
+        return [datasets[i] for i in selected.tolist()]
+    
+    def load_all_sources(self) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """Load FakeNewsNet, custom JSONL and PHEME data concurrently"""
+        # The loaders are independent and mostly wait on disk or C parsers
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            fakenewsnet = executor.submit(self.load_fakenewsnet_data)
+            custom = executor.submit(self.load_custom_jsonl_data)
+            pheme = executor.submit(self.load_pheme_data)
+            return fakenewsnet.result(), custom.result(), pheme.result()
     
     def create_training_dataset(self, min_samples: int = 20, max_per_class: Optional[int] = None) -> Dataset:
         """Create a unified training dataset from all available sources"""
         all_data = []
         
         # Load all available datasets
-        all_data.extend(self.load_fakenewsnet_data())
-        all_data.extend(self.load_custom_jsonl_data())
-        all_data.extend(self.load_pheme_data())
+        for source_data in self.load_all_sources():
+            all_data.extend(source_data)
         
         if len(all_data) < min_samples:
             raise ValueError(f"Insufficient training data: {len(all_data)} samples found, need at least {min_samples}")
         
-        # Remove duplicates based on text similarity
-        seen_texts = set()
-        unique_data = []
+        # Flatten into columns, dropping duplicates based on text similarity
+        texts, labels, sources = [], [], []
+        seen_hashes = set()
         for item in all_data:
             text_key = item['text'][:100].lower().strip()  # Use first 100 chars as key
-            if text_key not in seen_texts:
-                seen_texts.add(text_key)
-                unique_data.append(item)
+            # Keep 64-bit digests instead of the prefix strings themselves
+            key_hash = int.from_bytes(blake2b(text_key.encode(), digest_size=8).digest(), 'little')
+            if key_hash not in seen_hashes:
+                seen_hashes.add(key_hash)
+                texts.append(item['text'])
+                labels.append(item['label'])
+                sources.append(item['source'])
                 
-        logger.info(f"Removed {len(all_data) - len(unique_data)} duplicate samples")
-        
-        # Balance the dataset
-        balanced_data = self.balance_dataset(unique_data, max_per_class)
+        logger.info(f"Removed {len(all_data) - len(texts)} duplicate samples")
         
-        # Convert to HuggingFace Dataset format
-        texts = [item['text'] for item in balanced_data]
-        labels = [1 if item['label'] == 'REAL' else 0 for item in balanced_data]  # 1=REAL, 0=FAKE
+        # Balance the dataset by selecting rows from the Arrow columns
+        label_array = np.array(labels, dtype=object)
+        selected = pa.array(self.balanced_indices(label_array, max_per_class))
         
-        return Dataset.from_dict({
-            'text': texts,
-            'label': labels,
-            'source': [item['source'] for item in balanced_data]
-        })
+        # Convert to HuggingFace Dataset format, 1=REAL, 0=FAKE
+        return Dataset(pa.table({
+            'text': pa.array(texts, type=pa.string()).take(selected),
+            'label': pa.array(label_array == 'REAL').take(selected).cast(pa.int64()),
+            'source': pa.array(sources, type=pa.string()).take(selected)
+        }))
     
     def save_processed_dataset(self, dataset: Dataset, output_path: str = "processed_training_data.jsonl"):
         """Save processed dataset to JSONL format"""
         output_file = self.data_dir / output_path
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for item in dataset:
+        # Pull whole columns once instead of materializing a row view per record
+        dumps = orjson.dumps
+        with open(output_file, 'wb') as f:
+            for text, label, source in zip(dataset['text'], dataset['label'], dataset['source']):
                 record = {
-                    'text': item['text'],
-                    'label': 'REAL' if item['label'] == 1 else 'FAKE',
-                    'source': item['source']
+                    'text': text,
+                    'label': 'REAL' if label == 1 else 'FAKE',
+                    'source': source
                 }
-                f.write(json.dumps(record) + '\n')
+                f.write(dumps(record))
+                f.write(b'\n')
                 
         logger.info(f"Saved processed dataset to {output_file}")
         return output_file
 
+def _load_custom_jsonl_shard(full_path: str, start: int, end: int) -> List[Dict]:
+    """Parse the custom JSONL records whose lines start within [start, end)"""
+    processor = NewsDataProcessor()
+    parse = processor.parse_custom_record
+    records = []
+    
+    with open(full_path, 'rb') as f:
+        if start > 0:
+            # Step back one byte so a shard starting exactly on a line keeps it
+            f.seek(start - 1)
+            f.readline()
+        offset = f.tell()
+        
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            line_offset = offset
+            offset += len(line)
+            try:
+                record = parse(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                logger.warning(f"Invalid JSON at byte {line_offset} in {full_path}")
+                continue
+            if record:
+                records.append(record)
+                
+    return records
+
 # Utility functions for external use
 def get_training_data(data_dir: str = "data", min_samples: int = 20) -> Dataset:
     """Quick function to get training dataset"""
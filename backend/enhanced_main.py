@@ -2,27 +2,123 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
+import asyncio
+import hashlib
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import logging
 from pathlib import Path
-from typing import Optional
-import json
+from typing import Dict, Optional
+import orjson
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
 
 # Import our enhanced modules
-from inference_pipeline import analyze_news_text, save_analysis_result, inference_pipeline
+from inference_pipeline import analyze_news_text, build_analysis_record, get_inference_pipeline, ANALYSIS_DATA_FILE
 from simple_trainer import train_simple_model
 from data_processor import preprocess_datasets
+from fact_checker import close_fact_checker, configure_torch_threads
+from news_detector import get_news_detector
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Longest a shutdown waits for queued records to reach disk
+WRITER_STOP_TIMEOUT_SECONDS = 10.0
+
+class JsonlAppendWriter:
+    """Append JSON records to a file from a single background task"""
+    
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Flush everything still queued (within a timeout), then stop the writer task"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), WRITER_STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.error(f"Dropped {self._queue.qsize()} records not written to {self.file_path} in time")
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._queue = None
+    
+    def submit(self, record: Dict):
+        """Queue a record for the writer task, or append it directly when the task is not running"""
+        if self._task is None or self._task.done():
+            # Scripts and tests that use the app without its lifespan still get their records written
+            self._append(orjson.dumps(record) + b'\n')
+            return
+        self._queue.put_nowait(record)
+    
+    def _append(self, data: bytes):
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.file_path, 'ab') as f:
+            f.write(data)
+    
+    async def _run(self):
+        while True:
+            # Wait for one record, then take whatever else has queued up
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                data = b''.join(orjson.dumps(record) + b'\n' for record in batch)
+                await asyncio.to_thread(self._append, data)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} records to {self.file_path}: {e}")
+            finally:
+                # Always mark the batch done, so stop() never waits on a failed write
+                for _ in batch:
+                    self._queue.task_done()
+
+feedback_writer = JsonlAppendWriter(Path("data/user_feedback.jsonl"))
+analysis_writer = JsonlAppendWriter(ANALYSIS_DATA_FILE)
+
+# Keep-alive client for article URLs, shared across requests
+_url_client: Optional[httpx.AsyncClient] = None
+
+def get_url_client() -> httpx.AsyncClient:
+    """Shared HTTP client for fetching submitted URLs, created on first use"""
+    global _url_client
+    if _url_client is None or _url_client.is_closed:
+        _url_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=32)
+        )
+    return _url_client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    feedback_writer.start()
+    analysis_writer.start()
+    configure_torch_threads()
+    # Load the models before the first request rather than during it
+    await asyncio.to_thread(get_inference_pipeline)
+    await asyncio.to_thread(get_news_detector)
+    yield
+    await feedback_writer.stop()
+    await analysis_writer.stop()
+    if _url_client is not None:
+        await _url_client.aclose()
+    await close_fact_checker()
+
 app = FastAPI(
     title="Enhanced News Contrast AI", 
     version="1.0.0",
-    description="Advanced fake news detection with multi-layer analysis pipeline"
+    description="Advanced fake news detection with multi-layer analysis pipeline",
+    lifespan=lifespan
 ) 
 
 app.add_middleware(
@@ -35,6 +131,120 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Checked in order when extracting the main text of a fetched page
+CONTENT_SELECTORS = (
+    'article', '.article-content', '.post-content', '.entry-content',
+    'main', '[role="main"]', '.content'
+)
+
+# Bytes of a submitted page downloaded and parsed for its main content
+MAX_URL_HTML_BYTES = 1_000_000
+
+# Longest text analysed; submitted or extracted text beyond it is truncated
+MAX_TEXT_CHARS = 100_000
+
+# Extracted page text keyed by URL, revalidated with ETag/Last-Modified
+URL_CACHE_DIR = Path("data/url_cache")
+URL_CACHE_SIZE = 256
+_url_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+def _url_cache_file(url: str) -> Path:
+    return URL_CACHE_DIR / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+def _remember_url(url: str, entry: Dict):
+    """Keep an entry in the in-process LRU, evicting the oldest"""
+    _url_cache[url] = entry
+    _url_cache.move_to_end(url)
+    while len(_url_cache) > URL_CACHE_SIZE:
+        _url_cache.popitem(last=False)
+
+def _get_cached_url(url: str) -> Optional[Dict]:
+    """Look up a URL in memory first, then in the on-disk cache"""
+    entry = _url_cache.get(url)
+    if entry is not None:
+        _url_cache.move_to_end(url)
+        return entry
+    
+    cache_file = _url_cache_file(url)
+    if not cache_file.exists():
+        return None
+    try:
+        entry = orjson.loads(cache_file.read_bytes())
+    except Exception as e:
+        logger.warning(f"Failed to read URL cache for {url}: {e}")
+        return None
+    _remember_url(url, entry)
+    return entry
+
+def _save_cached_url(url: str, entry: Dict):
+    _remember_url(url, entry)
+    try:
+        URL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _url_cache_file(url).write_bytes(orjson.dumps(entry))
+    except Exception as e:
+        logger.warning(f"Failed to write URL cache for {url}: {e}")
+
+def extract_main_content(html: str) -> str:
+    """Extract the main article text from an HTML page"""
+    tree = LexborHTMLParser(html)
+    
+    # Try to extract main content
+    main_content = ""
+    
+    # Look for article content, then common content selectors
+    for selector in CONTENT_SELECTORS:
+        element = tree.css_first(selector)
+        if element:
+            main_content = element.text(strip=True)
+            break
+    
+    # Fallback to title + first few paragraphs
+    if not main_content:
+        title = tree.css_first('title')
+        paragraphs = tree.css('p')[:5]  # First 5 paragraphs
+        
+        title_text = title.text(strip=True) if title else ""
+        paragraph_text = " ".join(p.text(strip=True) for p in paragraphs)
+        
+        main_content = f"{title_text}. {paragraph_text}".strip()
+    
+    return main_content[:2000]  # Limit content length
+
+async def fetch_url_text(client: httpx.AsyncClient, url: str) -> str:
+    """Fetch a page and extract its text, reusing the cached text on 304 Not Modified"""
+    cached = _get_cached_url(url)
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    
+    async with client.stream('GET', url, headers=headers) as response:
+        if response.status_code == 304 and cached:
+            logger.info(f"URL not modified, reusing cached text: {url}")
+            return cached['text']
+        response.raise_for_status()
+        
+        # Stop downloading once the page is past any plausible article body
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) >= MAX_URL_HTML_BYTES:
+                break
+        html = body[:MAX_URL_HTML_BYTES].decode(response.encoding or 'utf-8', errors='replace')
+    
+    # Parsing is CPU-bound, so keep it off the event loop
+    text = await asyncio.to_thread(extract_main_content, html)
+    
+    # Only pages that support revalidation are worth caching
+    etag = response.headers.get('etag')
+    last_modified = response.headers.get('last-modified')
+    if etag or last_modified:
+        _save_cached_url(url, {'etag': etag, 'last_modified': last_modified, 'text': text})
+    
+    return text
+
 class AnalyzeRequest(BaseModel):
     url: HttpUrl | None = None
     text: str | None = None
@@ -75,55 +285,20 @@ async def analyze_news(request: AnalyzeRequest):
     try:
         text_to_analyze = ""
         
+        # Handle direct text input; it takes precedence, so the URL is only fetched without it
+        if request.text:
+            text_to_analyze = request.text
+        
         # Handle URL input
-        if request.url:
+        elif request.url:
             logger.info(f"Analyzing URL: {request.url}")
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                try:
-                    response = await client.get(str(request.url))
-                    response.raise_for_status()
-                    
-                    # Extract text content from HTML
-                    soup = BeautifulSoup(response.text, 'lxml')
-                    
-                    # Try to extract main content
-                    main_content = ""
-                    
-                    # Look for article content
-                    article = soup.find('article')
-                    if article:
-                        main_content = article.get_text(strip=True)
-                    else:
-                        # Look for common content selectors
-                        content_selectors = [
-                            '.article-content', '.post-content', '.entry-content',
-                            'main', '[role="main"]', '.content'
-                        ]
-                        
-                        for selector in content_selectors:
-                            element = soup.select_one(selector)
-                            if element:
-                                main_content = element.get_text(strip=True)
-                                break
-                    
-                    # Fallback to title + first few paragraphs
-                    if not main_content:
-                        title = soup.find('title')
-                        paragraphs = soup.find_all('p')[:5]  # First 5 paragraphs
-                        
-                        title_text = title.get_text(strip=True) if title else ""
-                        paragraph_text = " ".join(p.get_text(strip=True) for p in paragraphs)
-                        
-                        main_content = f"{title_text}. {paragraph_text}".strip()
-                    
-                    text_to_analyze = main_content[:2000]  # Limit content length
-                    
-                except httpx.HTTPError as e:
-                    raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {e}")
+            try:
+                text_to_analyze = await fetch_url_text(get_url_client(), str(request.url))
+            except httpx.HTTPError as e:
+                raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {e}")
         
-        # Handle direct text input
-        if request.text:
-            text_to_analyze = request.text
+        # Bound the text every model layer scans, however it was submitted
+        text_to_analyze = text_to_analyze[:MAX_TEXT_CHARS]
         
         if not text_to_analyze.strip():
             raise HTTPException(status_code=400, detail="No valid text content found")
@@ -147,9 +322,9 @@ async def analyze_news(request: AnalyzeRequest):
                 "content_length": len(text_to_analyze)
             }
         
-        # Save for continuous learning
+        # Save for continuous learning, written in the background off the request path
         try:
-            save_analysis_result(text_to_analyze, analysis_result)
+            analysis_writer.submit(build_analysis_record(text_to_analyze, analysis_result))
         except Exception as e:
             logger.warning(f"Failed to save analysis result: {e}")
         
@@ -174,11 +349,8 @@ async def submit_feedback(feedback: FeedbackRequest):
             'comments': feedback.comments
         }
         
-        feedback_file = Path("data/user_feedback.jsonl")
-        feedback_file.parent.mkdir(exist_ok=True)
-        
-        with open(feedback_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(feedback_record) + '\n')
+        # Written to disk in batches by the background feedback writer
+        feedback_writer.submit(feedback_record)
         
         return {
             "status": "success",
@@ -233,8 +405,7 @@ async def get_model_status():
         metadata_file = model_dir / "training_metadata.json"
         
         if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+            metadata = orjson.loads(metadata_file.read_bytes())
             
             return {
                 "model_available": True,
@@ -262,10 +433,8 @@ async def get_dataset_info():
         
         processor = NewsDataProcessor("data")
         
-        # Get counts from different sources
-        fakenewsnet_data = processor.load_fakenewsnet_data()
-        custom_data = processor.load_custom_jsonl_data()
-        pheme_data = processor.load_pheme_data()
+        # Get counts from different sources, loaded concurrently off the event loop
+        fakenewsnet_data, custom_data, pheme_data = await asyncio.to_thread(processor.load_all_sources)
         
         return {
             "dataset_sources": {
@@ -292,6 +461,62 @@ async def get_dataset_info():
         logger.error(f"Failed to get dataset info: {e}")
         return {"error": str(e)}
 
+_REAL_LABELS = frozenset({'REAL', 'TRUE', 'LEGITIMATE'})
+_FAKE_LABELS = frozenset({'FAKE', 'FALSE', 'FAKE (OVERRIDDEN)'})
+
+@lru_cache(maxsize=4)
+def _summarize_training_data(path: str, mtime_ns: int, size: int):
+    """Parse training_data.jsonl once per (path, mtime, size) and summarize it"""
+    total_entries = 0
+    label_counts = {"REAL": 0, "FAKE": 0, "OTHER": 0}
+    recent = deque(maxlen=10)
+    
+    with open(path, 'rb') as f:
+        for line_num, line in enumerate(f, 1):
+            try:
+                record = orjson.loads(line)
+                total_entries += 1
+                recent.append(record)
+                
+                # Extract label from different possible formats
+                label = None
+                if 'label' in record:
+                    label = str(record['label']).upper()
+                elif 'analysis_result' in record:
+                    # From analysis results
+                    ml_result = record.get('analysis_result', {}).get('ml_fake_news_check', {})
+                    if ml_result:
+                        label = str(ml_result.get('label', '')).upper()
+                elif 'ml_prediction' in record:
+                    label = str(record['ml_prediction']).upper()
+                
+                # Count labels
+                if label in _REAL_LABELS:
+                    label_counts["REAL"] += 1
+                elif label in _FAKE_LABELS:
+                    label_counts["FAKE"] += 1
+                else:
+                    label_counts["OTHER"] += 1
+                    
+            except orjson.JSONDecodeError:
+                logger.warning(f"Invalid JSON at line {line_num} in training data")
+                continue
+            except Exception as e:
+                logger.warning(f"Error processing line {line_num}: {e}")
+                continue
+    
+    # Get recent entries (last 10)
+    recent_entries = []
+    for entry in recent:
+        text = str(entry.get('text', ''))
+        recent_entries.append({
+            "timestamp": entry.get('timestamp', 'Unknown'),
+            "text_preview": text[:100] + "..." if len(text) > 100 else text,
+            "label": entry.get('label') or entry.get('ml_prediction', 'Unknown')
+        })
+    
+    return total_entries, label_counts, tuple(recent_entries)
+
 @app.get("/training-data/stats")
 async def get_training_data_stats():
     """Get statistics from the training_data.jsonl file"""
@@ -310,68 +535,27 @@ async def get_training_data_stats():
                 "recent_entries": []
             }
         
-        # Read and analyze the data
-        entries = []
-        label_counts = {"REAL": 0, "FAKE": 0, "OTHER": 0}
-        
-        with open(data_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                try:
-                    record = json.loads(line.strip())
-                    entries.append(record)
-                    
-                    # Extract label from different possible formats
-                    label = None
-                    if 'label' in record:
-                        label = str(record['label']).upper()
-                    elif 'analysis_result' in record:
-                        # From analysis results
-                        ml_result = record.get('analysis_result', {}).get('ml_fake_news_check', {})
-                        if ml_result:
-                            label = str(ml_result.get('label', '')).upper()
-                    elif 'ml_prediction' in record:
-                        label = str(record['ml_prediction']).upper()
-                    
-                    # Count labels
-                    if label in ['REAL', 'TRUE', 'LEGITIMATE']:
-                        label_counts["REAL"] += 1
-                    elif label in ['FAKE', 'FALSE', 'FAKE (OVERRIDDEN)']:
-                        label_counts["FAKE"] += 1
-                    else:
-                        label_counts["OTHER"] += 1
-                        
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON at line {line_num} in training data")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Error processing line {line_num}: {e}")
-                    continue
-        
-        # Get recent entries (last 10)
-        recent_entries = []
-        for entry in entries[-10:]:
-            recent_entry = {
-                "timestamp": entry.get('timestamp', 'Unknown'),
-                "text_preview": str(entry.get('text', ''))[:100] + "..." if len(str(entry.get('text', ''))) > 100 else str(entry.get('text', '')),
-                "label": entry.get('label') or entry.get('ml_prediction', 'Unknown')
-            }
-            recent_entries.append(recent_entry)
+        # Parsing is cached until the file changes on disk
+        stat = data_path.stat()
+        total_entries, label_counts, recent_entries = _summarize_training_data(
+            str(data_path), stat.st_mtime_ns, stat.st_size
+        )
         
         # Calculate file size
-        file_size = data_path.stat().st_size
+        file_size = stat.st_size
         
         return {
             "status": "success",
             "file_path": str(data_path),
             "file_size_bytes": file_size,
-            "total_entries": len(entries),
+            "total_entries": total_entries,
             "label_distribution": {
                 "REAL": label_counts["REAL"],
                 "FAKE": label_counts["FAKE"],
                 "OTHER": label_counts["OTHER"]
             },
-            "recent_entries": recent_entries,
-            "last_modified": datetime.fromtimestamp(data_path.stat().st_mtime).isoformat() if data_path.exists() else None
+            "recent_entries": [dict(entry) for entry in recent_entries],
+            "last_modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
         }
         
     except Exception as e:
@@ -404,11 +588,21 @@ async def test_pipeline():
         }
     ]
     
-    results = []
+    # The cases are independent, so run them concurrently
+    outcomes = await asyncio.gather(
+        *(analyze_news_text(case["text"], include_explanations=False) for case in test_cases),
+        return_exceptions=True
+    )
     
-    for case in test_cases:
-        try:
-            result = await analyze_news_text(case["text"], include_explanations=False)
+    results = []
+    for case, result in zip(test_cases, outcomes):
+        if isinstance(result, Exception):
+            results.append({
+                "test_text": case["text"],
+                "expected": case["expected_type"],
+                "error": str(result)
+            })
+        else:
             results.append({
                 "test_text": case["text"],
                 "expected": case["expected_type"],
@@ -419,12 +613,6 @@ async def test_pipeline():
                     "fact_status": result.get("fact_check", {}).get("status")
                 }
             })
-        except Exception as e:
-            results.append({
-                "test_text": case["text"],
-                "expected": case["expected_type"],
-                "error": str(e)
-            })
     
     return {
         "test_results": results,
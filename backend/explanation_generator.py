@@ -1,130 +1,264 @@
 # backend/explanation_generator.py
-from transformers import pipeline
-from typing import Dict, List, Optional
-import re
+import torch
+from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import os
+import random
 import logging
+import threading
+from collections import OrderedDict
+import ahocorasick
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Topic keywords used to categorize the news
+CATEGORY_KEYWORDS = {
+    'political': ('president', 'senator', 'congress', 'government', 'minister',
+                  'parliament', 'election', 'vote', 'policy', 'law'),
+    'economic': ('economy', 'market', 'stock', 'price', 'inflation', 'gdp',
+                 'company', 'business', 'financial', 'bank'),
+    'social': ('health', 'education', 'crime', 'community', 'social',
+               'public', 'people', 'citizen'),
+    'technology': ('technology', 'digital', 'internet', 'ai', 'computer',
+                   'software', 'data', 'cyber')
+}
+
+# Concerning topics flagged for real news
+CONCERN_KEYWORDS = {
+    'safety': ('crisis', 'emergency', 'disaster', 'threat'),
+    'violence': ('conflict', 'war', 'violence', 'attack'),
+    'legal': ('corruption', 'scandal', 'fraud', 'illegal'),
+    'economic': ('recession', 'unemployment', 'inflation', 'debt')
+}
+
+CONCERN_DESCRIPTIONS = {
+    'safety': "may involve serious public safety concerns",
+    'violence': "involves conflict or violence that affects communities",
+    'legal': "involves legal or ethical issues requiring investigation",
+    'economic': "may have negative economic implications"
+}
+
+# Readable descriptions of forensic red flags
+FLAG_DESCRIPTIONS = {
+    'excessive_exclamations': 'excessive use of exclamation marks',
+    'excessive_capitals': 'overuse of capital letters',
+    'clickbait_language': 'clickbait-style language patterns',
+    'overly_long_sentences': 'unusually long and complex sentences',
+    'no_source_attribution': 'lack of credible source citations'
+}
+
+# Template positive aspects per news category
+POSITIVE_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    'political': (
+        "This news may indicate progress in democratic processes and governance.",
+        "Political developments can lead to improved policies and public representation.",
+        "Such political events often reflect active civic engagement."
+    ),
+    'economic': (
+        "Economic news often signals market opportunities and growth potential.",
+        "Such developments may benefit businesses and employment prospects.",
+        "Economic changes can lead to improved financial conditions for many."
+    ),
+    'social': (
+        "This news highlights important social issues requiring public attention.",
+        "Social developments often lead to positive community changes.",
+        "Such events may drive awareness and social progress."
+    ),
+    'technology': (
+        "Technological developments typically drive innovation and progress.",
+        "Such tech news often represents advancement in human capabilities.",
+        "Technology stories frequently highlight problem-solving potential."
+    ),
+    'general': (
+        "This news provides important information for public awareness.",
+        "Such reporting contributes to an informed society.",
+        "News coverage helps people stay connected to current events."
+    )
+}
+
+# Longest article prefix scanned for entities, keywords and prompts
+MAX_ANALYZE_CHARS = 8192
+
+# Prompts for the optional AI-generated explanation parts
+AI_PROMPTS = {
+    'positive': "Identify positive aspects of this news: {text}",
+    'negative': "Identify potential risks or concerns from this news: {text}",
+    'neutral': "Provide neutral background context for this news: {text}"
+}
+
+# Template explanations by default; EXPLANATION_USE_AI=1 adds Flan-T5 generated text
+USE_AI_EXPLANATIONS = os.getenv("EXPLANATION_USE_AI", "0").lower() in ("1", "true", "yes")
+
+# Generated texts kept per prompt set
+AI_TEXT_CACHE_SIZE = 256
+
+# Greedy decoding that reuses the key/value cache between decoder steps
+GENERATION_KWARGS = {
+    "max_length": 100,
+    "do_sample": False,
+    "num_beams": 1,
+    "use_cache": True
+}
+
+# Optional ONNX Runtime export used for CPU inference when present, built with
+#   optimum-cli export onnx --model google/flan-t5-small --task text2text-generation-with-past --optimize O3 flan_t5_small_onnx/
+ONNX_MODEL_DIR = Path("flan_t5_small_onnx")
+
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    """Aho-Corasick automaton tagging every keyword with its (namespace, group)"""
+    tags = {}
+    for namespace, table in (('category', CATEGORY_KEYWORDS), ('concern', CONCERN_KEYWORDS)):
+        for group, keywords in table.items():
+            for keyword in keywords:
+                tags.setdefault(keyword, []).append((namespace, group, keyword))
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_tags in tags.items():
+        automaton.add_word(keyword, tuple(keyword_tags))
+    automaton.make_automaton()
+    return automaton
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+def _scan_keywords(text_lower: str) -> Dict[str, Dict[str, set]]:
+    """Distinct keywords found per group, keyed by namespace ('category' or 'concern')"""
+    # A single automaton pass beats per-keyword substring searches (str `in`,
+    # bytes.count) at every article length, so there is no short-text path
+    hits = {'category': {}, 'concern': {}}
+    for _, keyword_tags in KEYWORD_AUTOMATON.iter(text_lower):
+        for namespace, group, keyword in keyword_tags:
+            hits[namespace].setdefault(group, set()).add(keyword)
+    return hits
+
+@lru_cache(maxsize=1024)
+def _extract_key_entities_cached(text: str) -> Tuple[tuple, str, Tuple[str, ...], Tuple[str, ...]]:
+    """Entity extraction is pure, so repeat analyses of the same text reuse it"""
+    text_lower = text.lower()
+    
+    # One pass over the text finds both topic and concern keywords
+    keyword_hits = _scan_keywords(text_lower)
+    # Count per category, tracking the primary (first highest, else 'general') as we go
+    categories = {}
+    primary_category, best_count = 'general', 0
+    for category in CATEGORY_KEYWORDS:
+        count = len(keyword_hits['category'].get(category, ()))
+        categories[category] = count
+        if count > best_count:
+            primary_category, best_count = category, count
+    
+    # Extract mentioned entities: each title-case word plus the title-case words following it,
+    # stopping once the five reported entities are found
+    entities = []
+    words = text.split()
+    for i, word in enumerate(words):
+        if word.istitle() and len(word) > 2:
+            j = i + 1
+            while j < len(words) and words[j].istitle():
+                j += 1
+            entities.append(" ".join(words[i:j]))
+            if len(entities) == 5:
+                break
+    entities = tuple(entities)
+    
+    concerns = tuple(group for group in CONCERN_KEYWORDS if group in keyword_hits['concern'])
+    return tuple(categories.items()), primary_category, entities, concerns
+
 class NewsExplanationGenerator:
     """Generate balanced explanations for news analysis results"""
     
     def __init__(self):
+        # Models load on first use, so template-only requests never pay for them
+        self._text_generator = None
+        self._models_loaded = False
+        self._lock = threading.Lock()
+        
+        # prompt items -> generated (key, text) pairs, least recently used first
+        self._ai_text_cache: OrderedDict = OrderedDict()
+        self._ai_text_cache_lock = threading.Lock()
+    
+    @property
+    def text_generator(self):
+        """Flan-T5 pipeline, loaded once on first access (None if unavailable)"""
+        if not self._models_loaded:
+            with self._lock:
+                if not self._models_loaded:
+                    self._load_models()
+        return self._text_generator
+    
+    def _load_models(self):
+        """Load the text generator, logging instead of raising"""
         try:
             # Load a text generation model for creating explanations
-            self.text_generator = pipeline(
-                "text2text-generation",
-                model="google/flan-t5-small",  # Lightweight model for explanations
-                max_length=200
-            )
+            self._text_generator = self._load_text_generator()
         except Exception as e:
             logger.warning(f"Could not load text generation model: {e}")
-            self.text_generator = None
+        self._models_loaded = True
+    
+    def _load_text_generator(self):
+        """Build the Flan-T5 pipeline in the cheapest precision for the available hardware"""
+        model_name = "google/flan-t5-small"  # Lightweight model for explanations
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        
+        if torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+            # T5 overflows in fp16, bf16 keeps its range at half the memory traffic
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=torch.bfloat16, use_cache=True)
+            device = 0
+        elif ONNX_MODEL_DIR.exists():
+            # ORT runs the exported graph with fused attention and layer norm kernels
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+            model = ORTModelForSeq2SeqLM.from_pretrained(ONNX_MODEL_DIR, use_cache=True)
+            device = -1
+        else:
+            # CPU decoding is bound by weight reads, so use int8 linear layers
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name, use_cache=True)
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            device = -1
+        
+        text_generator = pipeline(
+            "text2text-generation",
+            model=model,
+            tokenizer=tokenizer,
+            device=device,
+            max_length=200
+        )
+        
+        # Batched prompts are padded, so generation needs an explicit pad token
+        generation_config = text_generator.model.generation_config
+        if generation_config.pad_token_id is None:
+            generation_config.pad_token_id = tokenizer.pad_token_id
+        
+        return text_generator
     
     def _extract_key_entities(self, text: str) -> Dict:
         """Extract key entities and topics from the news text"""
-        text_lower = text.lower()
-        
-        # Political entities
-        political_keywords = ['president', 'senator', 'congress', 'government', 'minister', 
-                            'parliament', 'election', 'vote', 'policy', 'law']
-        
-        # Economic entities  
-        economic_keywords = ['economy', 'market', 'stock', 'price', 'inflation', 'gdp',
-                           'company', 'business', 'financial', 'bank']
-        
-        # Social entities
-        social_keywords = ['health', 'education', 'crime', 'community', 'social',
-                         'public', 'people', 'citizen']
-        
-        # Technology entities
-        tech_keywords = ['technology', 'digital', 'internet', 'ai', 'computer',
-                        'software', 'data', 'cyber']
-        
-        categories = {
-            'political': sum(1 for kw in political_keywords if kw in text_lower),
-            'economic': sum(1 for kw in economic_keywords if kw in text_lower),
-            'social': sum(1 for kw in social_keywords if kw in text_lower),
-            'technology': sum(1 for kw in tech_keywords if kw in text_lower)
-        }
-        
-        # Determine primary category
-        primary_category = max(categories, key=categories.get) if any(categories.values()) else 'general'
-        
-        # Extract mentioned entities (simple approach)
-        entities = []
-        
-        # Find proper nouns (capitalized words)
-        words = text.split()
-        for i, word in enumerate(words):
-            if word.istitle() and len(word) > 2:
-                # Check if it's part of a multi-word entity
-                entity = word
-                j = i + 1
-                while j < len(words) and words[j].istitle():
-                    entity += " " + words[j]
-                    j += 1
-                entities.append(entity)
-        
+        categories, primary_category, entities, concerns = _extract_key_entities_cached(text)
         return {
-            'categories': categories,
+            'categories': dict(categories),
             'primary_category': primary_category,
-            'entities': entities[:5]  # Limit to top 5 entities
+            'entities': list(entities),  # Limited to top 5 entities
+            'concerns': list(concerns)
         }
     
-    def _generate_positive_aspects(self, text: str, entities: Dict, classification: str) -> str:
+    def _generate_positive_aspects(self, text: str, entities: Dict, classification: str,
+                                 ai_generated: Optional[str] = None) -> str:
         """Generate positive aspects of the news"""
         if classification == "FAKE":
             return "N/A for fake news"
         
         primary_category = entities['primary_category']
         
-        # Template-based positive aspect generation
-        positive_templates = {
-            'political': [
-                "This news may indicate progress in democratic processes and governance.",
-                "Political developments can lead to improved policies and public representation.",
-                "Such political events often reflect active civic engagement."
-            ],
-            'economic': [
-                "Economic news often signals market opportunities and growth potential.",
-                "Such developments may benefit businesses and employment prospects.",
-                "Economic changes can lead to improved financial conditions for many."
-            ],
-            'social': [
-                "This news highlights important social issues requiring public attention.",
-                "Social developments often lead to positive community changes.",
-                "Such events may drive awareness and social progress."
-            ],
-            'technology': [
-                "Technological developments typically drive innovation and progress.",
-                "Such tech news often represents advancement in human capabilities.",
-                "Technology stories frequently highlight problem-solving potential."
-            ],
-            'general': [
-                "This news provides important information for public awareness.",
-                "Such reporting contributes to an informed society.",
-                "News coverage helps people stay connected to current events."
-            ]
-        }
-        
-        # Use AI generation if available
-        if self.text_generator and len(text) > 20:
-            try:
-                prompt = f"Identify positive aspects of this news: {text[:200]}"
-                result = self.text_generator(prompt, max_length=100, do_sample=False)
-                ai_generated = result[0]['generated_text'].strip()
-                if ai_generated and len(ai_generated) > 10:
-                    return ai_generated
-            except Exception as e:
-                logger.debug(f"AI generation failed for positive aspects: {e}")
+        # Prefer the AI-generated text when available
+        if ai_generated:
+            return ai_generated
         
         # Fallback to templates
-        import random
-        return random.choice(positive_templates.get(primary_category, positive_templates['general']))
+        templates = POSITIVE_TEMPLATES.get(primary_category) or POSITIVE_TEMPLATES['general']
+        return templates[random.randrange(len(templates))]
     
     def _generate_negative_aspects(self, text: str, entities: Dict, classification: str, 
-                                 forensic_results: Dict) -> str:
+                                 forensic_results: Dict, ai_generated: Optional[str] = None) -> str:
         """Generate negative aspects or concerns"""
         if classification == "FAKE":
             red_flags = forensic_results.get('credibility_assessment', {}).get('red_flags', [])
@@ -134,41 +268,20 @@ class NewsExplanationGenerator:
                 return "This content appears to be fake news and may spread misinformation."
         
         # For real news, identify potential concerns
-        concerns = []
-        text_lower = text.lower()
-        
-        # Check for concerning topics
-        if any(word in text_lower for word in ['crisis', 'emergency', 'disaster', 'threat']):
-            concerns.append("may involve serious public safety concerns")
-        
-        if any(word in text_lower for word in ['conflict', 'war', 'violence', 'attack']):
-            concerns.append("involves conflict or violence that affects communities")
-        
-        if any(word in text_lower for word in ['corruption', 'scandal', 'fraud', 'illegal']):
-            concerns.append("involves legal or ethical issues requiring investigation")
-        
-        # Economic concerns
-        if any(word in text_lower for word in ['recession', 'unemployment', 'inflation', 'debt']):
-            concerns.append("may have negative economic implications")
+        concerns = [CONCERN_DESCRIPTIONS[group] for group in entities['concerns']]
         
         if concerns:
             return f"Potential concerns: This news {', and '.join(concerns)}."
         
-        # Use AI generation if available
-        if self.text_generator and len(text) > 20:
-            try:
-                prompt = f"Identify potential risks or concerns from this news: {text[:200]}"
-                result = self.text_generator(prompt, max_length=100, do_sample=False)
-                ai_generated = result[0]['generated_text'].strip()
-                if ai_generated and len(ai_generated) > 10:
-                    return ai_generated
-            except Exception as e:
-                logger.debug(f"AI generation failed for negative aspects: {e}")
+        # Prefer the AI-generated text when available
+        if ai_generated:
+            return ai_generated
         
         # Default neutral response
         return "As with all news, it's important to consider multiple perspectives and verify information through additional sources."
     
-    def _generate_neutral_context(self, text: str, entities: Dict, fact_check_result: Dict) -> str:
+    def _generate_neutral_context(self, text: str, entities: Dict, fact_check_result: Dict,
+                                ai_generated: Optional[str] = None) -> str:
         """Generate neutral, contextual information"""
         context_points = []
         
@@ -192,18 +305,57 @@ class NewsExplanationGenerator:
             context_points.append(f"This falls under {primary_cat} news category")
         
         # Use AI for additional context if available
-        if self.text_generator and len(text) > 20:
-            try:
-                prompt = f"Provide neutral background context for this news: {text[:200]}"
-                result = self.text_generator(prompt, max_length=100, do_sample=False)
-                ai_context = result[0]['generated_text'].strip()
-                if ai_context and len(ai_context) > 10:
-                    context_points.append(ai_context)
-            except Exception as e:
-                logger.debug(f"AI generation failed for neutral context: {e}")
+        if ai_generated:
+            context_points.append(ai_generated)
         
         return ". ".join(context_points) if context_points else "Additional context is recommended for full understanding."
     
+    def _generate_ai_texts(self, prompts: Dict[str, str]) -> Dict[str, str]:
+        """Run all prompts through the text generator as one batch, keeping usable outputs"""
+        if not prompts or not self.text_generator:
+            return {}
+        
+        # Decoding is deterministic, so the same article prefix reuses earlier outputs
+        prompt_items = tuple(prompts.items())
+        with self._ai_text_cache_lock:
+            cached = self._ai_text_cache.get(prompt_items)
+            if cached is not None:
+                self._ai_text_cache.move_to_end(prompt_items)
+                return dict(cached)
+        
+        try:
+            generated = self._run_text_generator(prompt_items)
+        except Exception as e:
+            logger.debug(f"AI generation failed for {', '.join(prompts)}: {e}")
+            return {}
+        
+        with self._ai_text_cache_lock:
+            self._ai_text_cache[prompt_items] = generated
+            while len(self._ai_text_cache) > AI_TEXT_CACHE_SIZE:
+                self._ai_text_cache.popitem(last=False)
+        return dict(generated)
+    
+    def _run_text_generator(self, prompt_items: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, str], ...]:
+        """Generate text for each (key, prompt), keeping only usable outputs"""
+        keys = [key for key, _ in prompt_items]
+        ai_texts = self._generate_batch([prompt for _, prompt in prompt_items], GENERATION_KWARGS)
+        
+        generated = []
+        for key, ai_text in zip(keys, ai_texts):
+            ai_text = ai_text.strip()
+            if ai_text and len(ai_text) > 10:
+                generated.append((key, ai_text))
+        return tuple(generated)
+    
+    def _generate_batch(self, prompts: List[str], generate_kwargs: Dict) -> List[str]:
+        """Tokenize the prompts once and call generate directly, skipping the pipeline's per-item steps"""
+        tokenizer = self.text_generator.tokenizer
+        model = self.text_generator.model
+        with torch.inference_mode():
+            inputs = tokenizer(prompts, padding=True, return_tensors="pt").to(model.device)
+            output_ids = model.generate(**inputs, **generate_kwargs)
+        return tokenizer.batch_decode(output_ids, skip_special_tokens=True, clean_up_tokenization_spaces=False)
+    
     def _generate_fake_news_explanation(self, text: str, ml_result: Dict, 
                                       forensic_results: Dict, fact_check_result: Dict) -> str:
         """Generate explanation for why content is classified as fake news"""
@@ -217,15 +369,7 @@ class NewsExplanationGenerator:
         # Forensic red flags
         red_flags = forensic_results.get('credibility_assessment', {}).get('red_flags', [])
         if red_flags:
-            flag_descriptions = {
-                'excessive_exclamations': 'excessive use of exclamation marks',
-                'excessive_capitals': 'overuse of capital letters',
-                'clickbait_language': 'clickbait-style language patterns',
-                'overly_long_sentences': 'unusually long and complex sentences',
-                'no_source_attribution': 'lack of credible source citations'
-            }
-            
-            flag_explanations = [flag_descriptions.get(flag, flag) for flag in red_flags]
+            flag_explanations = [FLAG_DESCRIPTIONS.get(flag, flag) for flag in red_flags]
             reasons.append(f"Forensic analysis detected: {', '.join(flag_explanations)}")
         
         # Fact-check reasoning
@@ -237,55 +381,79 @@ class NewsExplanationGenerator:
         
         # Sensational keywords
         sensational = forensic_results.get('content_analysis', {}).get('sensational_keywords', {})
-        found_sensational = [category for category, words in sensational.items() if words]
+        found_sensational = ', '.join(category for category, words in sensational.items() if words)
         if found_sensational:
-            reasons.append(f"Contains sensational language patterns: {', '.join(found_sensational)}")
+            reasons.append(f"Contains sensational language patterns: {found_sensational}")
         
         if reasons:
             return f"This content is likely fake because: {'; '.join(reasons)}."
         else:
             return "This content shows patterns typical of fake news, though specific indicators may vary."
     
+    def _format_context(self, summary: str, entities: Dict, *details: str) -> str:
+        """Build the context line shared by the FAKE and REAL explanations"""
+        key_entities = ', '.join(entities['entities'][:3]) if entities['entities'] else 'None identified'
+        return " ".join((summary, f"Primary category: {entities['primary_category']}.",
+                         *details, f"Key entities: {key_entities}."))
+    
     def generate_comprehensive_explanation(self, 
                                          text: str, 
                                          classification: str,
                                          ml_result: Dict,
                                          fact_check_result: Dict,
-                                         forensic_results: Dict) -> Dict:
+                                         forensic_results: Dict,
+                                         use_ai: Optional[bool] = None) -> Dict:
         """Generate comprehensive explanation for the analysis results"""
+        if use_ai is None:
+            use_ai = USE_AI_EXPLANATIONS
+        
+        # Generate input summary
+        input_summary = text[:200] + "..." if len(text) > 200 else text
+        
+        # Everything below only looks at the head of the article, so bound the scans
+        text = text[:MAX_ANALYZE_CHARS]
         
         # Extract entities and context
         entities = self._extract_key_entities(text)
         
-        # Generate input summary
-        input_summary = text[:200] + "..." if len(text) > 200 else text
+        # Collect every AI prompt this explanation needs and generate them in one batch
+        prompts = {}
+        if use_ai and len(text) > 20:
+            text_head = text[:200]
+            if classification != "FAKE":
+                prompts['positive'] = AI_PROMPTS['positive'].format(text=text_head)
+                if not entities['concerns']:
+                    prompts['negative'] = AI_PROMPTS['negative'].format(text=text_head)
+            prompts['neutral'] = AI_PROMPTS['neutral'].format(text=text_head)
+        ai_texts = self._generate_ai_texts(prompts)
         
         if classification == "FAKE":
             return {
                 'positive': "N/A - Content classified as fake news",
                 'negative': self._generate_fake_news_explanation(text, ml_result, forensic_results, fact_check_result),
-                'neutral': self._generate_neutral_context(text, entities, fact_check_result),
-                'context': f"Analysis based on ML classification, forensic checks, and fact verification. "
-                          f"Primary category: {entities['primary_category']}. "
-                          f"Key entities: {', '.join(entities['entities'][:3]) if entities['entities'] else 'None identified'}."
+                'neutral': self._generate_neutral_context(text, entities, fact_check_result, ai_texts.get('neutral')),
+                'context': self._format_context(
+                    "Analysis based on ML classification, forensic checks, and fact verification.", entities)
             }
         else:  # REAL news
             return {
-                'positive': self._generate_positive_aspects(text, entities, classification),
-                'negative': self._generate_negative_aspects(text, entities, classification, forensic_results),
-                'neutral': self._generate_neutral_context(text, entities, fact_check_result),
-                'context': f"This appears to be legitimate news content. "
-                          f"Primary category: {entities['primary_category']}. "
-                          f"Verification status: {fact_check_result.get('status', 'Unknown')}. "
-                          f"Key entities: {', '.join(entities['entities'][:3]) if entities['entities'] else 'None identified'}."
+                'positive': self._generate_positive_aspects(text, entities, classification, ai_texts.get('positive')),
+                'negative': self._generate_negative_aspects(text, entities, classification, forensic_results,
+                                                            ai_texts.get('negative')),
+                'neutral': self._generate_neutral_context(text, entities, fact_check_result, ai_texts.get('neutral')),
+                'context': self._format_context(
+                    "This appears to be legitimate news content.", entities,
+                    f"Verification status: {fact_check_result.get('status', 'Unknown')}.")
             }
 
-# Global instance
-explanation_generator = NewsExplanationGenerator()
+@lru_cache(maxsize=1)
+def get_generator() -> NewsExplanationGenerator:
+    """Process-wide explanation generator, created on first request"""
+    return NewsExplanationGenerator()
 
 def generate_news_explanation(text: str, classification: str, ml_result: Dict,
                             fact_check_result: Dict, forensic_results: Dict) -> Dict:
     """Utility function to generate news explanation"""
-    return explanation_generator.generate_comprehensive_explanation(
+    return get_generator().generate_comprehensive_explanation(
         text, classification, ml_result, fact_check_result, forensic_results
     )
@@ -1,24 +1,111 @@
 # backend/inference_pipeline.py
+import asyncio
+import hashlib
 import torch
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 import logging
+import orjson
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 
 # Import our custom modules
-from news_detector import news_detector
-from fact_checker import fact_checker, run_enhanced_forensic_checks
-from explanation_generator import explanation_generator
+from news_detector import get_news_detector
+from fact_checker import fact_check_with_forensics, model_thread_count
+from explanation_generator import get_generator
 
 logger = logging.getLogger(__name__)
 
+# ONNX export of the pre-trained classifier, created on first load
+CLASSIFIER_ONNX_DIR = Path("cache") / "classifier_onnx"
+CLASSIFIER_QUANTIZATION = "avx2"
+CLASSIFIER_ONNX_FILE = "model_quantized.onnx"
+
+# The classifier sees up to ML_MAX_TOKENS tokens; longer text is cut at a character
+# bound first so the tokenizer does not process text that would be truncated anyway
+ML_MAX_TOKENS = 512
+ML_MAX_INPUT_CHARS = 8 * ML_MAX_TOKENS
+
+# Classifier results kept for repeated inputs
+ML_RESULT_CACHE_SIZE = 1024
+
+# Classifier labels across the supported models, mapped to REAL/FAKE
+REAL_ML_LABELS = frozenset({'REAL', 'LABEL_1', 'TRUE', 'LEGITIMATE'})
+FAKE_ML_LABELS = frozenset({'FAKE', 'LABEL_0', 'FALSE', 'TOXIC'})
+ML_LABEL_CLASSES = {
+    **dict.fromkeys(REAL_ML_LABELS, 'REAL'),
+    **dict.fromkeys(FAKE_ML_LABELS, 'FAKE')
+}
+
+# Concurrent classifications are grouped into one forward pass of up to this many texts
+ML_MAX_BATCH = 16
+ML_BATCH_WAIT_SECONDS = 0.005
+
+class ClassificationBatcher:
+    """Collect concurrent classification requests and run them through the model as one batch"""
+    
+    def __init__(self, classify_batch: Callable[[List[str]], List],
+                 max_batch: int = ML_MAX_BATCH, max_wait: float = ML_BATCH_WAIT_SECONDS):
+        self.classify_batch = classify_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def classify(self, text: str):
+        """Model output for one text, computed together with any requests arriving alongside it"""
+        if self._task is None or self._task.done():
+            # Started on first use, so it runs in the serving event loop
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for one request, then gather more until the batch is full or the wait is over
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                outputs = await asyncio.to_thread(self.classify_batch, [text for text, _ in batch])
+            except Exception:
+                # One bad input must not fail the others, so retry them one at a time
+                for text, future in batch:
+                    try:
+                        output = (await asyncio.to_thread(self.classify_batch, [text]))[0]
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        if not future.done():
+                            future.set_result(output)
+                continue
+            
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+
 class FakeNewsInferencePipeline:
     """Complete inference pipeline for fake news detection with multi-layer analysis"""
     
     def __init__(self, model_dir: str = "model_out"):
         self.model_dir = Path(model_dir)
         self.ml_pipeline = None
+        self._batcher = ClassificationBatcher(self._classify_batch)
+        # Input hash -> result, least recently used first, and classifications still running
+        self._ml_result_cache: OrderedDict = OrderedDict()
+        self._pending_ml: Dict[bytes, asyncio.Future] = {}
         self.load_ml_model()
     
     def load_ml_model(self):
@@ -26,17 +113,11 @@ class FakeNewsInferencePipeline:
         try:
             if self.model_dir.exists() and (self.model_dir / "pytorch_model.bin").exists():
                 logger.info(f"Loading custom trained model from {self.model_dir}")
-                self.ml_pipeline = pipeline(
-                    "text-classification", 
-                    model=str(self.model_dir),
-                    return_all_scores=True
-                )
+                self.ml_pipeline = self._build_classifier(str(self.model_dir), self.model_dir / "onnx")
             else:
                 logger.info("No custom model found, using pre-trained model")
-                self.ml_pipeline = pipeline(
-                    "text-classification",
-                    model="mrm8488/bert-tiny-finetuned-fake-news-detection",
-                    return_all_scores=True
+                self.ml_pipeline = self._build_classifier(
+                    "mrm8488/bert-tiny-finetuned-fake-news-detection", CLASSIFIER_ONNX_DIR
                 )
         except Exception as e:
             logger.error(f"Failed to load ML model: {e}")
@@ -49,77 +130,167 @@ class FakeNewsInferencePipeline:
             except:
                 self.ml_pipeline = None
     
+    def _build_classifier(self, model_name: str, onnx_dir: Path):
+        """Classification pipeline in fp16 on GPU, else int8 on an optimized ONNX Runtime graph or PyTorch"""
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if torch.cuda.is_available():
+            # Half precision halves the weight traffic and runs the matmuls on tensor cores
+            model = AutoModelForSequenceClassification.from_pretrained(model_name, torch_dtype=torch.float16)
+            return pipeline(
+                "text-classification",
+                model=model,
+                tokenizer=tokenizer,
+                device=0,
+                return_all_scores=True
+            )
+        
+        try:
+            import onnxruntime as ort
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            
+            # Fuse attention/layer norm kernels and fold constants when the session is built
+            session_options = ort.SessionOptions()
+            session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            # Same thread budget as torch, which runs the other models alongside this session
+            session_options.intra_op_num_threads = model_thread_count()
+            session_options.inter_op_num_threads = 1
+            
+            onnx_file = onnx_dir / CLASSIFIER_ONNX_FILE
+            weights_file = Path(model_name) / "pytorch_model.bin"
+            if not onnx_file.exists() or (weights_file.exists() and
+                                          weights_file.stat().st_mtime > onnx_file.stat().st_mtime):
+                # Export once; a retrained custom model is newer than its export and gets re-exported
+                logger.info(f"Exporting {model_name} to quantized ONNX in {onnx_dir}")
+                ORTModelForSequenceClassification.from_pretrained(model_name, export=True).save_pretrained(onnx_dir)
+                # Dynamic int8 on the MatMuls only; softmax and layer norm stay fp32
+                quantization_config = getattr(AutoQuantizationConfig, CLASSIFIER_QUANTIZATION)(
+                    is_static=False, per_channel=False, operators_to_quantize=["MatMul"]
+                )
+                ORTQuantizer.from_pretrained(onnx_dir).quantize(
+                    save_dir=onnx_dir, quantization_config=quantization_config
+                )
+            
+            model = ORTModelForSequenceClassification.from_pretrained(
+                onnx_dir, file_name=CLASSIFIER_ONNX_FILE, session_options=session_options
+            )
+        except Exception as e:
+            logger.warning(f"ONNX Runtime classifier unavailable for {model_name}, using PyTorch: {e}")
+            model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            # The linear layers dominate BERT on CPU, int8 weights halve their memory traffic
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        
+        return pipeline(
+            "text-classification",
+            model=model,
+            tokenizer=tokenizer,
+            return_all_scores=True
+        )
+    
     def run_ml_classification(self, text: str) -> Dict:
         """Run ML-based fake news classification"""
         if not self.ml_pipeline:
-            return {
-                'label': 'UNKNOWN',
-                'confidence': 0.5,
-                'reason': 'ML model not available'
-            }
+            return self._unknown_ml_result('ML model not available')
         
         try:
-            # Limit text length for model input
-            input_text = text[:512]
+            # Limit text length for model input; the tokenizer truncates to the model's window
+            input_text = text[:ML_MAX_INPUT_CHARS]
             
             # Get prediction
-            results = self.ml_pipeline(input_text)
-            
-            # Handle different model output formats
-            if isinstance(results, list) and len(results) > 0:
-                if isinstance(results[0], list):
-                    # Multiple scores returned
-                    predictions = results[0]
-                    # Find REAL/FAKE or similar labels
-                    real_score = 0.5
-                    fake_score = 0.5
-                    
-                    for pred in predictions:
-                        label = pred['label'].upper()
-                        score = pred['score']
-                        
-                        if label in ['REAL', 'LABEL_1', 'TRUE', 'LEGITIMATE']:
-                            real_score = score
-                        elif label in ['FAKE', 'LABEL_0', 'FALSE', 'TOXIC']:
-                            fake_score = score
-                    
-                    if real_score > fake_score:
-                        final_label = 'REAL'
-                        confidence = real_score
-                    else:
-                        final_label = 'FAKE'
-                        confidence = fake_score
-                else:
-                    # Single prediction
-                    pred = results[0]
-                    label = pred['label'].upper()
-                    confidence = pred['score']
-                    
-                    # Map various label formats to REAL/FAKE
-                    if label in ['REAL', 'LABEL_1', 'TRUE', 'LEGITIMATE']:
-                        final_label = 'REAL'
-                    elif label in ['FAKE', 'LABEL_0', 'FALSE', 'TOXIC']:
-                        final_label = 'FAKE'
-                    else:
-                        # Unknown label format, use score to decide
-                        final_label = 'REAL' if confidence > 0.5 else 'FAKE'
-            else:
-                final_label = 'UNKNOWN'
-                confidence = 0.5
+            with torch.inference_mode():
+                results = self.ml_pipeline(input_text, truncation=True, max_length=ML_MAX_TOKENS)
+            return self._interpret_ml_results(results)
             
-            return {
-                'label': final_label,
-                'confidence': round(float(confidence), 3),
-                'reason': f'ML model prediction with {confidence:.1%} confidence'
-            }
+        except Exception as e:
+            logger.error(f"ML classification failed: {e}")
+            return self._unknown_ml_result(f'ML classification error: {str(e)}')
+    
+    async def run_ml_classification_batched(self, text: str) -> Dict:
+        """Run ML-based fake news classification in one forward pass with concurrent requests"""
+        if not self.ml_pipeline:
+            return self._unknown_ml_result('ML model not available')
+        
+        # Same truncation as run_ml_classification, so identical model inputs share a result
+        input_text = text[:ML_MAX_INPUT_CHARS]
+        key = hashlib.blake2b(input_text.encode('utf-8'), digest_size=16).digest()
+        cached = self._ml_result_cache.get(key)
+        if cached is not None:
+            self._ml_result_cache.move_to_end(key)
+            return dict(cached)
+        
+        # Concurrent requests for the same text share one in-flight classification
+        task = self._pending_ml.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._classify_and_cache(key, input_text))
+            self._pending_ml[key] = task
+            task.add_done_callback(lambda _: self._pending_ml.pop(key, None))
+        return dict(await asyncio.shield(task))
+    
+    async def _classify_and_cache(self, key: bytes, input_text: str) -> Dict:
+        try:
+            # The batcher returns one text's output
+            results = [await self._batcher.classify(input_text)]
+            result = self._interpret_ml_results(results)
             
         except Exception as e:
             logger.error(f"ML classification failed: {e}")
-            return {
-                'label': 'UNKNOWN',
-                'confidence': 0.5,
-                'reason': f'ML classification error: {str(e)}'
-            }
+            return self._unknown_ml_result(f'ML classification error: {str(e)}')
+        
+        # Only successful predictions are cached, so errors are retried
+        self._ml_result_cache[key] = result
+        while len(self._ml_result_cache) > ML_RESULT_CACHE_SIZE:
+            self._ml_result_cache.popitem(last=False)
+        return result
+    
+    def _classify_batch(self, texts: List[str]) -> List:
+        """Pipeline output for each text, from a single padded forward pass"""
+        # Inference mode is per thread, so it is entered here in the worker thread
+        with torch.inference_mode():
+            return self.ml_pipeline(texts, batch_size=len(texts), truncation=True, max_length=ML_MAX_TOKENS)
+    
+    def _unknown_ml_result(self, reason: str) -> Dict:
+        return {
+            'label': 'UNKNOWN',
+            'confidence': 0.5,
+            'reason': reason
+        }
+    
+    def _interpret_ml_results(self, results) -> Dict:
+        """Map the pipeline output for one text to a REAL/FAKE label and confidence"""
+        # Handle different model output formats
+        if isinstance(results, list) and len(results) > 0:
+            if isinstance(results[0], list):
+                # Multiple scores returned
+                predictions = results[0]
+                # Find REAL/FAKE or similar labels
+                scores = {'REAL': 0.5, 'FAKE': 0.5}
+                
+                for pred in predictions:
+                    label_class = ML_LABEL_CLASSES.get(pred['label'].upper())
+                    if label_class is not None:
+                        scores[label_class] = pred['score']
+                
+                if scores['REAL'] > scores['FAKE']:
+                    final_label = 'REAL'
+                else:
+                    final_label = 'FAKE'
+                confidence = scores[final_label]
+            else:
+                # Single prediction
+                pred = results[0]
+                confidence = pred['score']
+                
+                # Map various label formats to REAL/FAKE; for an unknown label format, use score to decide
+                final_label = ML_LABEL_CLASSES.get(pred['label'].upper()) or ('REAL' if confidence > 0.5 else 'FAKE')
+        else:
+            final_label = 'UNKNOWN'
+            confidence = 0.5
+        
+        return {
+            'label': final_label,
+            'confidence': round(float(confidence), 3),
+            'reason': f'ML model prediction with {confidence:.1%} confidence'
+        }
     
     def apply_hybrid_correction(self, 
                                ml_result: Dict, 
@@ -190,7 +361,7 @@ class FakeNewsInferencePipeline:
         """
         
         # Step 1: News Detection Layer
-        news_detection = news_detector.detect_news(text)
+        news_detection = get_news_detector().detect_news(text)
         
         if not news_detection['is_news']:
             return {
@@ -201,14 +372,12 @@ class FakeNewsInferencePipeline:
                 'analysis_timestamp': datetime.now().isoformat()
             }
         
-        # Step 2: Validity & Fact-Check Layer
-        fact_check_result = await fact_checker.comprehensive_fact_check(text)
-        
-        # Step 3: Forensic Analysis
-        forensic_results = run_enhanced_forensic_checks(text)
-        
-        # Step 4: ML Classification
-        ml_result = self.run_ml_classification(text)
+        # Steps 2-4: Validity & Fact-Check Layer with Forensic Analysis, and ML Classification.
+        # They are independent, so the model runs in a thread while the headlines are fetched
+        (fact_check_result, forensic_results), ml_result = await asyncio.gather(
+            fact_check_with_forensics(text),
+            self.run_ml_classification_batched(text)
+        )
         
         # Step 5: Apply Hybrid Correction
         final_ml_result = self.apply_hybrid_correction(ml_result, forensic_results, fact_check_result)
@@ -219,7 +388,7 @@ class FakeNewsInferencePipeline:
         # Step 7: Generate Explanations (if requested)
         explanations = {}
         if include_explanations:
-            explanations = explanation_generator.generate_comprehensive_explanation(
+            explanations = get_generator().generate_comprehensive_explanation(
                 text, final_ml_result['label'], final_ml_result, fact_check_result, forensic_results
             )
         
@@ -277,34 +446,34 @@ class FakeNewsInferencePipeline:
     
     def quick_classify(self, text: str) -> str:
         """Quick classification without full analysis"""
-        news_detection = news_detector.detect_news(text)
+        news_detection = get_news_detector().detect_news(text)
         if not news_detection['is_news']:
             return 'Not news'
         
         ml_result = self.run_ml_classification(text)
         return ml_result['label']
 
-# Global inference pipeline instance
-inference_pipeline = FakeNewsInferencePipeline()
+@lru_cache(maxsize=1)
+def get_inference_pipeline() -> FakeNewsInferencePipeline:
+    """Process-wide inference pipeline, so every caller shares one copy of the classifier"""
+    return FakeNewsInferencePipeline()
 
 # Utility functions for external use
 async def analyze_news_text(text: str, include_explanations: bool = True) -> Dict:
     """Main function for analyzing news text"""
-    return await inference_pipeline.analyze_text(text, include_explanations)
+    return await get_inference_pipeline().analyze_text(text, include_explanations)
 
 def quick_news_check(text: str) -> str:
     """Quick news validity check"""
-    return inference_pipeline.quick_classify(text)
+    return get_inference_pipeline().quick_classify(text)
 
 # Data collection function for continuous learning
-def save_analysis_result(text: str, result: Dict, user_feedback: Optional[str] = None):
-    """Save analysis results for continuous model improvement"""
-    # Use backend/data directory to be consistent with existing data
-    backend_dir = Path(__file__).parent  # Current directory is backend/
-    data_file = backend_dir / "data" / "training_data.jsonl"
-    data_file.parent.mkdir(exist_ok=True)
-    
-    record = {
+# Use backend/data directory to be consistent with existing data
+ANALYSIS_DATA_FILE = Path(__file__).parent / "data" / "training_data.jsonl"
+
+def build_analysis_record(text: str, result: Dict, user_feedback: Optional[str] = None) -> Dict:
+    """Training data record for one analysis"""
+    return {
         'timestamp': datetime.now().isoformat(),
         'text': text,
         'analysis_result': result,
@@ -312,10 +481,14 @@ def save_analysis_result(text: str, result: Dict, user_feedback: Optional[str] =
         'ml_prediction': result.get('ml_fake_news_check', {}).get('label'),
         'fact_check_status': result.get('fact_check', {}).get('status')
     }
+
+def save_analysis_result(text: str, result: Dict, user_feedback: Optional[str] = None):
+    """Save analysis results for continuous model improvement"""
+    ANALYSIS_DATA_FILE.parent.mkdir(exist_ok=True)
+    record = build_analysis_record(text, result, user_feedback)
     
     try:
-        with open(data_file, 'a', encoding='utf-8') as f:
-            import json
-            f.write(json.dumps(record) + '\n')
+        with open(ANALYSIS_DATA_FILE, 'ab') as f:
+            f.write(orjson.dumps(record) + b'\n')
     except Exception as e:
         logger.error(f"Failed to save analysis result: {e}")
@@ -1,61 +1,144 @@
 # backend/news_detector.py
+import ahocorasick
+import hashlib
 import re
-from typing import Dict, List, Tuple
-from transformers import pipeline
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from transformers import pipeline, AutoTokenizer
+from fact_checker import model_thread_count
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Distilled MNLI model for the zero-shot news check, exported once to dynamic int8 ONNX
+ZERO_SHOT_MODEL_NAME = "valhalla/distilbart-mnli-12-3"
+ZERO_SHOT_ONNX_DIR = Path("cache") / "zero_shot_onnx"
+ZERO_SHOT_QUANTIZATION = "avx2"
+ZERO_SHOT_ONNX_FILE = "model_quantized.onnx"
+
+# Texts whose detection scores are kept for repeats
+DETECTION_CACHE_SIZE = 1024
+
+# Zero-shot candidate labels; the news probability is the total score of the news labels
+NEWS_ZERO_SHOT_LABELS = frozenset({"news article", "headline", "breaking news"})
+ZERO_SHOT_LABELS = ("news article", "headline", "breaking news",
+                    "casual conversation", "random text", "advertisement")
+
+# News-specific vocabulary, matched as substrings of the lowercased text
+NEWS_KEYWORDS = {
+    'temporal': ('today', 'yesterday', 'breaking', 'latest', 'recent', 'now', 'just'),
+    'authority': ('president', 'minister', 'official', 'spokesperson', 'government',
+                  'police', 'court', 'judge', 'senator', 'congress'),
+    'reporting': ('said', 'reported', 'according', 'sources', 'confirmed',
+                  'announced', 'revealed', 'disclosed', 'stated'),
+    'locations': ('city', 'state', 'country', 'national', 'local', 'international'),
+    'organizations': ('company', 'corporation', 'department', 'agency', 'committee')
+}
+
+def _build_keyword_automaton(keywords) -> ahocorasick.Automaton:
+    """Aho-Corasick automaton reporting each keyword it finds as the match value"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+NEWS_KEYWORD_AUTOMATON = _build_keyword_automaton(
+    {keyword for keywords in NEWS_KEYWORDS.values() for keyword in keywords}
+)
+
+# Four-digit years and "City, Region" style locations
+YEAR_RE = re.compile(r'\b(?:20\d{2}|19\d{2})\b')
+LOCATION_RE = re.compile(r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b')
+
+# Openings that mark text as conversation rather than a headline
+CONVERSATIONAL_PREFIXES = ('hi', 'hello', 'i', 'you', 'what', 'how')
+CONVERSATIONAL_PREFIX_CHARS = max(map(len, CONVERSATIONAL_PREFIXES))
+
 class NewsDetector:
     """Advanced news detection system to identify if text is news content"""
     
     def __init__(self):
+        # text hash -> (features, rule-based score, AI score or None until a threshold needs it),
+        # least recently used first; scores do not depend on the threshold, so every threshold
+        # shares one entry
+        self._analysis_cache: OrderedDict = OrderedDict()
+        
         # Load a classification model for text analysis
         try:
             # Use a general text classification model to help with news detection
-            self.text_classifier = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli"
-            )
+            self.text_classifier = self._load_zero_shot_classifier()
         except Exception as e:
             logger.warning(f"Could not load zero-shot classifier: {e}")
             self.text_classifier = None
     
+    def _load_zero_shot_classifier(self):
+        """Zero-shot pipeline on the int8 ONNX export of the distilled MNLI model, falling back to PyTorch"""
+        try:
+            import onnxruntime as ort
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            
+            # Same thread budget as torch and the classifier session
+            session_options = ort.SessionOptions()
+            session_options.intra_op_num_threads = model_thread_count()
+            session_options.inter_op_num_threads = 1
+            
+            if not (ZERO_SHOT_ONNX_DIR / ZERO_SHOT_ONNX_FILE).exists():
+                logger.info(f"Exporting {ZERO_SHOT_MODEL_NAME} to quantized ONNX in {ZERO_SHOT_ONNX_DIR}")
+                model = ORTModelForSequenceClassification.from_pretrained(ZERO_SHOT_MODEL_NAME, export=True)
+                model.save_pretrained(ZERO_SHOT_ONNX_DIR)
+                AutoTokenizer.from_pretrained(ZERO_SHOT_MODEL_NAME).save_pretrained(ZERO_SHOT_ONNX_DIR)
+                # Dynamic int8 on the MatMuls only; softmax and layer norm stay fp32
+                quantization_config = getattr(AutoQuantizationConfig, ZERO_SHOT_QUANTIZATION)(
+                    is_static=False, per_channel=False, operators_to_quantize=["MatMul"]
+                )
+                ORTQuantizer.from_pretrained(ZERO_SHOT_ONNX_DIR).quantize(
+                    save_dir=ZERO_SHOT_ONNX_DIR, quantization_config=quantization_config
+                )
+            
+            return pipeline(
+                "zero-shot-classification",
+                model=ORTModelForSequenceClassification.from_pretrained(
+                    ZERO_SHOT_ONNX_DIR, file_name=ZERO_SHOT_ONNX_FILE, session_options=session_options
+                ),
+                tokenizer=AutoTokenizer.from_pretrained(ZERO_SHOT_ONNX_DIR)
+            )
+        except Exception as e:
+            logger.warning(f"Could not load quantized ONNX zero-shot classifier, using PyTorch: {e}")
+            return pipeline(
+                "zero-shot-classification",
+                model=ZERO_SHOT_MODEL_NAME
+            )
+    
     def _extract_linguistic_features(self, text: str) -> Dict:
         """Extract linguistic features that indicate news content"""
         words = text.split()
+        word_count = len(words)
         sentences = text.split('.')
         
-        # News-specific vocabulary
-        news_keywords = {
-            'temporal': ['today', 'yesterday', 'breaking', 'latest', 'recent', 'now', 'just'],
-            'authority': ['president', 'minister', 'official', 'spokesperson', 'government', 
-                         'police', 'court', 'judge', 'senator', 'congress'],
-            'reporting': ['said', 'reported', 'according', 'sources', 'confirmed', 
-                         'announced', 'revealed', 'disclosed', 'stated'],
-            'locations': ['city', 'state', 'country', 'national', 'local', 'international'],
-            'organizations': ['company', 'corporation', 'department', 'agency', 'committee']
-        }
-        
-        # Count occurrences of each category
-        category_counts = {}
+        # Count the distinct news keywords of each category, found in one automaton pass
         text_lower = text.lower()
-        
-        for category, keywords in news_keywords.items():
-            count = sum(1 for keyword in keywords if keyword in text_lower)
-            category_counts[category] = count
+        found_keywords = {keyword for _, keyword in NEWS_KEYWORD_AUTOMATON.iter(text_lower)}
+        category_counts = {
+            category: len(found_keywords.intersection(keywords))
+            for category, keywords in NEWS_KEYWORDS.items()
+        }
         
         # Calculate features
         features = {
-            'word_count': len(words),
-            'sentence_count': max(1, len([s for s in sentences if s.strip()])),
-            'avg_words_per_sentence': len(words) / max(1, len(sentences)),
+            'word_count': word_count,
+            # A fragment counts as a sentence unless it is empty or all whitespace
+            'sentence_count': max(1, sum(1 for s in sentences if s and not s.isspace())),
+            'avg_words_per_sentence': word_count / max(1, len(sentences)),
             'news_keyword_categories': category_counts,
             'total_news_keywords': sum(category_counts.values()),
             'has_quotes': '"' in text or "'" in text,
-            'has_timestamps': bool(re.search(r'\b(20\d{2}|19\d{2})\b', text)),
-            'has_locations': bool(re.search(r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b', text)),
-            'title_case_ratio': sum(1 for w in words if w.istitle()) / max(len(words), 1)
+            'has_timestamps': bool(YEAR_RE.search(text)),
+            'has_locations': bool(LOCATION_RE.search(text)),
+            'title_case_ratio': sum(map(str.istitle, words)) / max(word_count, 1)
         }
         
         return features
@@ -110,25 +193,29 @@ class NewsDetector:
     
     def _use_ai_classification(self, text: str) -> float:
         """Use AI model to classify if text is news-related"""
+        return self._use_ai_classification_batch([text])[0]
+    
+    def _use_ai_classification_batch(self, texts: List[str]) -> List[float]:
+        """Use AI model to classify if each text is news-related, in one pipeline call"""
         if not self.text_classifier:
-            return 0.5  # Neutral if no model available
+            return [0.5] * len(texts)  # Neutral if no model available
             
         try:
-            candidate_labels = ["news article", "headline", "breaking news", 
-                              "casual conversation", "random text", "advertisement"]
-            
-            result = self.text_classifier(text[:512], candidate_labels)
+            results = self.text_classifier([text[:512] for text in texts], list(ZERO_SHOT_LABELS),
+                                           batch_size=len(texts))
+            if isinstance(results, dict):
+                results = [results]
             
             # Calculate news probability from classification scores
-            news_labels = ["news article", "headline", "breaking news"]
-            news_score = sum(score for label, score in zip(result['labels'], result['scores']) 
-                           if label in news_labels)
-            
-            return min(news_score, 1.0)
+            return [
+                min(sum(score for label, score in zip(result['labels'], result['scores'])
+                        if label in NEWS_ZERO_SHOT_LABELS), 1.0)
+                for result in results
+            ]
             
         except Exception as e:
             logger.warning(f"AI classification failed: {e}")
-            return 0.5
+            return [0.5] * len(texts)
     
     def detect_news(self, text: str, threshold: float = 0.6) -> Dict:
         """
@@ -141,27 +228,68 @@ class NewsDetector:
         Returns:
             Dict with detection results
         """
-        if not text or len(text.strip()) < 3:
-            return {
-                'is_news': False,
-                'confidence': 0.0,
-                'reason': 'Text too short or empty',
-                'features': {}
-            }
-        
-        # Extract features
-        features = self._extract_linguistic_features(text)
-        
-        # Calculate rule-based probability
-        rule_based_score = self._calculate_news_probability(text, features)
-        
-        # Get AI-based probability
-        ai_score = self._use_ai_classification(text)
+        return self.detect_news_batch([text], threshold)[0]
+    
+    def detect_news_batch(self, texts: List[str], threshold: float = 0.6) -> List[Dict]:
+        """Detect news content in several texts, running the AI model over them as one batch"""
+        detections: List[Optional[Dict]] = [None] * len(texts)
+        scored = []  # (index, cache key, features, rule-based score) of texts still to classify
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 3:
+                detections[i] = {
+                    'is_news': False,
+                    'confidence': 0.0,
+                    'reason': 'Text too short or empty',
+                    'features': {}
+                }
+                continue
+            
+            # Repeated texts reuse the earlier analysis, whatever the threshold
+            key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+            cached = self._analysis_cache.get(key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(key)
+                features, rule_based_score, ai_score = cached
+            else:
+                # Extract features and calculate rule-based probability
+                features = self._extract_linguistic_features(text)
+                rule_based_score = self._calculate_news_probability(text, features)
+                ai_score = None
+                self._analysis_cache[key] = (features, rule_based_score, ai_score)
+            
+            # The AI score (0 to 1) carries 0.3 of the weight; when neither extreme can move
+            # the combined score across the threshold, skip the model
+            rule_part = 0.7 * rule_based_score
+            if rule_part >= threshold or rule_part + 0.3 < threshold:
+                detections[i] = self._build_detection(features, rule_based_score, None, threshold)
+            elif ai_score is not None:
+                detections[i] = self._build_detection(features, rule_based_score, ai_score, threshold)
+            else:
+                scored.append((i, key, features, rule_based_score))
         
-        # Combine scores (weighted average)
-        combined_score = 0.7 * rule_based_score + 0.3 * ai_score
+        # Get AI-based probabilities
+        ai_scores = self._use_ai_classification_batch([texts[i] for i, _, _, _ in scored]) if scored else []
         
-        is_news = combined_score >= threshold
+        for (i, key, features, rule_based_score), ai_score in zip(scored, ai_scores):
+            # Detections are rebuilt from the cached scores, so callers never share the features dict
+            self._analysis_cache[key] = (features, rule_based_score, ai_score)
+            detections[i] = self._build_detection(features, rule_based_score, ai_score, threshold)
+        while len(self._analysis_cache) > DETECTION_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return detections
+    
+    def _build_detection(self, features: Dict, rule_based_score: float, ai_score: Optional[float],
+                         threshold: float) -> Dict:
+        """Combine the rule-based and AI scores into a detection result"""
+        if ai_score is None:
+            # The AI model was skipped since the rule-based part alone decides the outcome;
+            # the reported confidence is then the rule-based score, marked by 'ai_skipped'
+            combined_score = rule_based_score
+            is_news = 0.7 * rule_based_score >= threshold
+        else:
+            # Combine scores (weighted average)
+            combined_score = 0.7 * rule_based_score + 0.3 * ai_score
+            is_news = combined_score >= threshold
         
         # Determine reason
         if not is_news:
@@ -195,7 +323,8 @@ class NewsDetector:
                 'has_reporting_language': features['news_keyword_categories']['reporting'] > 0,
                 'has_quotes': features['has_quotes'],
                 'rule_based_score': round(rule_based_score, 3),
-                'ai_score': round(ai_score, 3) if ai_score != 0.5 else None
+                'ai_score': round(ai_score, 3) if ai_score is not None and ai_score != 0.5 else None,
+                'ai_skipped': ai_score is None
             }
         }
     
@@ -205,7 +334,8 @@ class NewsDetector:
         return (
             4 <= len(words) <= 25 and  # Reasonable headline length
             any(w.istitle() for w in words) and  # Contains proper nouns
-            not text.lower().startswith(('hi', 'hello', 'i', 'you', 'what', 'how'))  # Not conversational
+            # Not conversational; only the opening characters need lowercasing
+            not text[:CONVERSATIONAL_PREFIX_CHARS].lower().startswith(CONVERSATIONAL_PREFIXES)
         )
     
     def is_news_article(self, text: str) -> bool:
@@ -216,5 +346,7 @@ class NewsDetector:
             self.detect_news(text, threshold=0.5)['is_news']  # Lower threshold for full articles
         )
 
-# Global instance for use across modules
-news_detector = NewsDetector()
+@lru_cache(maxsize=1)
+def get_news_detector() -> NewsDetector:
+    """Process-wide news detector, created on first request so importing the module loads no model"""
+    return NewsDetector()
@@ -5,11 +5,17 @@ Simple but working trainer for fake news detection
 
 import json
 import logging
+import orjson
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
 import pickle
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+import scipy.sparse as sp
+import joblib
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import make_pipeline
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, f1_score
@@ -18,6 +24,13 @@ from sklearn.metrics import accuracy_score, classification_report, f1_score
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Hashed feature space; no vocabulary dict to build, pickle or look up
+HASHING_N_FEATURES = 2 ** 14
+# Corpus size above which training texts are hashed in parallel chunks
+PARALLEL_HASHING_MIN_DOCS = 20000
+# Model artifacts; the .pkl names are still read for models saved before joblib
+MODEL_ARTIFACTS = ("vectorizer", "classifier")
+
 class SimpleNewsTrainer:
     """Simple trainer that actually creates working model files"""
     
@@ -27,12 +40,18 @@ class SimpleNewsTrainer:
         self.model_dir.mkdir(exist_ok=True)
         
         # Initialize components
-        self.vectorizer = TfidfVectorizer(
-            max_features=10000,
-            ngram_range=(1, 2),
-            stop_words='english',
-            lowercase=True,
-            strip_accents='unicode'
+        self.vectorizer = make_pipeline(
+            HashingVectorizer(
+                n_features=HASHING_N_FEATURES,
+                ngram_range=(1, 2),
+                stop_words='english',
+                lowercase=True,
+                strip_accents='unicode',
+                alternate_sign=False,
+                norm=None,
+                dtype=np.float32
+            ),
+            TfidfTransformer(use_idf=True)
         )
         self.classifier = LogisticRegression(
             random_state=42,
@@ -83,11 +102,10 @@ class SimpleNewsTrainer:
         # Load data
         data = []
         try:
-            with open(training_file, 'r', encoding='utf-8') as f:
+            with open(training_file, 'rb', buffering=1 << 20) as f:
                 for line in f:
-                    if line.strip():
-                        item = json.loads(line.strip())
-                        data.append(item)
+                    if line and not line.isspace():
+                        data.append(orjson.loads(line))
         except Exception as e:
             logger.error(f"Error loading training data: {e}")
             return [], []
@@ -108,7 +126,7 @@ class SimpleNewsTrainer:
                 label = str(item['label']).upper()
             elif 'analysis_result' in item:
                 # Complex format from analysis results
-                ml_result = item.get('analysis_result', {}).get('ml_fake_news_check', {})
+                ml_result = item['analysis_result'].get('ml_fake_news_check', {})
                 if ml_result:
                     label = str(ml_result.get('label', '')).upper()
             elif 'ml_prediction' in item:
@@ -148,7 +166,7 @@ class SimpleNewsTrainer:
         
         # Vectorize text
         logger.info("Vectorizing text data...")
-        X_train_vec = self.vectorizer.fit_transform(X_train)
+        X_train_vec = self._fit_transform_texts(X_train)
         X_test_vec = self.vectorizer.transform(X_test)
         
         # Train classifier
@@ -178,23 +196,46 @@ class SimpleNewsTrainer:
             'test_samples': len(X_test)
         }
     
+    def _fit_transform_texts(self, texts):
+        """Hash texts (in parallel chunks for large corpora) and fit the IDF weights"""
+        if len(texts) < PARALLEL_HASHING_MIN_DOCS:
+            return self.vectorizer.fit_transform(texts)
+        
+        # The hasher is stateless, so chunks can be tokenized independently
+        hasher, tfidf = self.vectorizer[0], self.vectorizer[1]
+        chunk_size = -(-len(texts) // effective_n_jobs(-1))
+        chunks = Parallel(n_jobs=-1)(
+            delayed(hasher.transform)(texts[i:i + chunk_size])
+            for i in range(0, len(texts), chunk_size)
+        )
+        return tfidf.fit_transform(sp.vstack(chunks, format='csr'))
+    
     def save_model(self, accuracy, f1_score, total_samples):
         """Save the trained model and metadata"""
         logger.info(f"Saving model to {self.model_dir}")
         
-        # Save vectorizer
-        with open(self.model_dir / "vectorizer.pkl", 'wb') as f:
-            pickle.dump(self.vectorizer, f)
-        
-        # Save classifier
-        with open(self.model_dir / "classifier.pkl", 'wb') as f:
-            pickle.dump(self.classifier, f)
+        # Save vectorizer and classifier; lz4 decompresses at near memcpy speed
+        try:
+            import lz4  # noqa: F401
+            compress = ('lz4', 3)
+        except ImportError:
+            compress = ('zlib', 3)
+        # The IDF vector is kept out of the vectorizer dump and saved raw, so that
+        # every worker can memory-map one page-cache copy of it
+        tfidf = self.vectorizer[-1]
+        np.save(self.model_dir / "idf.npy", tfidf.idf_)
+        idf = tfidf.__dict__.pop('idf_')
+        try:
+            for name in MODEL_ARTIFACTS:
+                joblib.dump(getattr(self, name), self.model_dir / f"{name}.joblib", compress=compress)
+        finally:
+            tfidf.idf_ = idf
         
         # Save metadata
         metadata = {
             'model_name': 'simple_fake_news_detector',
             'model_type': 'sklearn_logistic_regression',
-            'vectorizer_type': 'tfidf',
+            'vectorizer_type': 'hashing_tfidf',
             'train_samples': total_samples,
             'final_metrics': {
                 'eval_accuracy': accuracy,
@@ -202,7 +243,7 @@ class SimpleNewsTrainer:
             },
             'trained_at': datetime.now().isoformat(),
             'features': {
-                'max_features': 10000,
+                'n_features': HASHING_N_FEATURES,
                 'ngram_range': [1, 2],
                 'stop_words': 'english'
             }
@@ -216,11 +257,17 @@ class SimpleNewsTrainer:
     def load_model(self):
         """Load the trained model"""
         try:
-            with open(self.model_dir / "vectorizer.pkl", 'rb') as f:
-                self.vectorizer = pickle.load(f)
+            for name in MODEL_ARTIFACTS:
+                path = self.model_dir / f"{name}.joblib"
+                if path.exists():
+                    setattr(self, name, joblib.load(path))
+                else:
+                    with open(self.model_dir / f"{name}.pkl", 'rb') as f:
+                        setattr(self, name, pickle.load(f))
             
-            with open(self.model_dir / "classifier.pkl", 'rb') as f:
-                self.classifier = pickle.load(f)
+            # Without idf_ the transformer would silently skip IDF weighting, so it is required
+            if (self.model_dir / "vectorizer.joblib").exists():
+                self.vectorizer[-1].idf_ = np.load(self.model_dir / "idf.npy", mmap_mode='r')
             
             logger.info("Model loaded successfully")
             return True
@@ -236,22 +283,23 @@ class SimpleNewsTrainer:
         # Vectorize
         X_vec = self.vectorizer.transform(texts)
         
-        # Get predictions and probabilities
-        predictions = self.classifier.predict(X_vec)
+        # One probability pass; the predicted class is its argmax, as in classifier.predict
         probabilities = self.classifier.predict_proba(X_vec)
+        is_real = self.classifier.classes_[probabilities.argmax(axis=1)] == 1
+        confidences = probabilities.max(axis=1)
         
-        results = []
-        for i, text in enumerate(texts):
-            pred_label = "REAL" if predictions[i] == 1 else "FAKE"
-            confidence = max(probabilities[i])
-            
-            results.append({
+        results = [
+            {
                 'text': text,
-                'predicted_label': pred_label,
+                'predicted_label': "REAL" if real else "FAKE",
                 'confidence': float(confidence),
-                'fake_probability': float(probabilities[i][0]),
-                'real_probability': float(probabilities[i][1])
-            })
+                'fake_probability': float(fake_p),
+                'real_probability': float(real_p)
+            }
+            for text, real, confidence, fake_p, real_p in zip(
+                texts, is_real, confidences, probabilities[:, 0], probabilities[:, 1]
+            )
+        ]
         
         return results[0] if len(texts) == 1 else results
 
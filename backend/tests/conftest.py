@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# Tests never download models; loaders fall back to their model-free paths
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+# The backend modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,131 @@
+import re
+from pathlib import Path
+
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from data_processor import NEWS_INDICATORS, NewsDataProcessor
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# The per-call patterns clean_text used before they were precompiled
+ORIGINAL_URL_PATTERN = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+
+
+def original_clean_text(text):
+    text = re.sub(r'\s+', ' ', text.strip())
+    text = re.sub(ORIGINAL_URL_PATTERN, '[URL]', text)
+    text = re.sub(r'[!]{3,}', '!!!', text)
+    text = re.sub(r'[?]{3,}', '???', text)
+    return text.strip()
+
+
+def original_is_valid_news_text(text):
+    if not text or len(text.strip()) < 10:
+        return False
+    words = text.split()
+    if len(words) < 3:
+        return False
+    text_lower = text.lower()
+    indicator_count = sum(1 for indicator in NEWS_INDICATORS if indicator in text_lower)
+    return indicator_count > 0 or (text.count('.') > 0 and len(words) > 5)
+
+
+def shipped_texts():
+    texts = []
+    for path in sorted(DATA_DIR.glob("*.jsonl")):
+        for line in path.read_bytes().splitlines():
+            if line.strip():
+                text = orjson.loads(line).get('text')
+                if isinstance(text, str) and text:
+                    texts.append(text)
+    return texts
+
+
+EDGE_TEXTS = [
+    'See <meta content="https://example.com/a?b=1"/><meta name="x"> here',
+    "Wow!!!!! Really???? https://t.co/abc, said police",
+    "  spaced\t\nout   text  ",
+    "Short",
+]
+
+
+@pytest.fixture(scope="module")
+def texts():
+    return shipped_texts() + EDGE_TEXTS
+
+
+def test_clean_text_matches_original(texts):
+    processor = NewsDataProcessor()
+    assert [processor.clean_text(text) for text in texts] == [original_clean_text(text) for text in texts]
+
+
+def test_clean_text_series_matches_original(texts):
+    cleaned = NewsDataProcessor().clean_text_series(pd.Series(texts))
+    assert cleaned.tolist() == [original_clean_text(text) for text in texts]
+
+
+def test_validity_checks_match_original(texts):
+    processor = NewsDataProcessor()
+    cleaned = [original_clean_text(text) for text in texts]
+    expected = [original_is_valid_news_text(text) for text in cleaned]
+    assert [processor.is_valid_news_text(text) for text in cleaned] == expected
+    assert processor.valid_news_mask(pa.array(cleaned, type=pa.string())).to_pylist() == expected
+
+
+def test_sharded_jsonl_load_matches_serial(tmp_path, monkeypatch):
+    import data_processor
+    
+    lines = [orjson.dumps({"text": f"Officials said report number {i} was released.",
+                           "label": "REAL" if i % 2 else "FAKE"}) for i in range(500)]
+    lines.insert(250, b"{not json")
+    path = tmp_path / "sharded_test.jsonl"
+    path.write_bytes(b"\n".join(lines) + b"\n")
+    
+    monkeypatch.setattr(data_processor, "PARALLEL_JSONL_MIN_BYTES", 0)
+    monkeypatch.setattr(data_processor.os, "cpu_count", lambda: 3)
+    processor = NewsDataProcessor(str(tmp_path))
+    serial = data_processor._load_custom_jsonl_shard(str(path), 0, path.stat().st_size)
+    assert len(serial) == 500
+    assert processor.load_custom_jsonl_data("sharded_test.jsonl") == serial
+
+
+def test_custom_jsonl_matches_stdlib_json_parse():
+    import json
+    
+    processor = NewsDataProcessor()
+    path = processor.custom_jsonl_path()
+    expected = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = processor.parse_custom_record(json.loads(line))
+                if record:
+                    expected.append(record)
+    assert expected
+    assert processor.load_custom_jsonl_data() == expected
+
+
+def test_loader_cache_reused_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "cache_test.jsonl"
+    record = {"text": "Officials said the council approved the budget.", "label": "REAL"}
+    path.write_bytes(orjson.dumps(record) + b"\n")
+    
+    parsed = []
+    parse = NewsDataProcessor.parse_custom_record
+    monkeypatch.setattr(NewsDataProcessor, "parse_custom_record",
+                        lambda self, item: parsed.append(item) or parse(self, item))
+    processor = NewsDataProcessor(str(tmp_path))
+    
+    first = processor.load_custom_jsonl_data("cache_test.jsonl")
+    first.clear()  # callers get their own list
+    assert len(processor.load_custom_jsonl_data("cache_test.jsonl")) == 1
+    assert len(NewsDataProcessor(str(tmp_path)).load_custom_jsonl_data("cache_test.jsonl")) == 1
+    assert len(parsed) == 1
+    
+    with open(path, 'ab') as f:
+        f.write(orjson.dumps(dict(record, label="FAKE")) + b"\n")
+    assert [item['label'] for item in processor.load_custom_jsonl_data("cache_test.jsonl")] == ['REAL', 'FAKE']
+    assert len(parsed) == 3
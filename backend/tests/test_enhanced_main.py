@@ -0,0 +1,151 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import orjson
+
+import enhanced_main
+from enhanced_main import JsonlAppendWriter
+
+
+def read_records(path):
+    return [orjson.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def test_writer_appends_directly_when_not_started(tmp_path):
+    path = tmp_path / "nested" / "records.jsonl"
+    writer = JsonlAppendWriter(path)
+    writer.submit({"n": 1})
+    writer.submit({"n": 2})
+    assert read_records(path) == [{"n": 1}, {"n": 2}]
+
+
+def test_writer_flushes_queued_records_on_stop(tmp_path):
+    path = tmp_path / "records.jsonl"
+    writer = JsonlAppendWriter(path)
+    
+    async def run():
+        writer.start()
+        for n in range(50):
+            writer.submit({"n": n})
+        await writer.stop()
+    
+    asyncio.run(run())
+    assert read_records(path) == [{"n": n} for n in range(50)]
+    # Once stopped, records are appended directly again
+    writer.submit({"n": 50})
+    assert read_records(path)[-1] == {"n": 50}
+
+
+def test_writer_stop_returns_after_failed_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(enhanced_main, "WRITER_STOP_TIMEOUT_SECONDS", 1.0)
+    # A directory cannot be opened for appending, so every write fails
+    writer = JsonlAppendWriter(tmp_path)
+    
+    async def run():
+        writer.start()
+        writer.submit({"n": 1})
+        await asyncio.sleep(0)
+        writer.submit({"n": 2})
+        await asyncio.wait_for(writer.stop(), 5)
+    
+    asyncio.run(run())
+    assert writer._task is None
+
+
+def test_submitted_text_truncated_before_analysis(monkeypatch):
+    from fastapi.testclient import TestClient
+    
+    analyzed = []
+    
+    async def fake_analyze(text, include_explanations=True):
+        analyzed.append(text)
+        raise RuntimeError("stop after capturing the text")
+    
+    monkeypatch.setattr(enhanced_main, "analyze_news_text", fake_analyze)
+    too_long = "a" * (enhanced_main.MAX_TEXT_CHARS + 1)
+    response = TestClient(enhanced_main.app).post("/analyze", json={"text": too_long})
+    assert response.status_code == 500
+    assert analyzed == [too_long[:enhanced_main.MAX_TEXT_CHARS]]
+
+
+def test_feedback_accepts_long_text(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    
+    monkeypatch.setattr(enhanced_main, "feedback_writer", JsonlAppendWriter(tmp_path / "feedback.jsonl"))
+    too_long = "a" * (enhanced_main.MAX_TEXT_CHARS + 1)
+    feedback = {"text": too_long, "analysis_id": "1", "user_feedback": "correct"}
+    assert TestClient(enhanced_main.app).post("/feedback", json=feedback).status_code == 200
+    assert read_records(tmp_path / "feedback.jsonl")[0]["text"] == too_long
+
+
+def test_url_text_truncated_before_analysis(monkeypatch):
+    from fastapi.testclient import TestClient
+    
+    analyzed = []
+    
+    async def fake_fetch(client, url):
+        return "Officials said " * enhanced_main.MAX_TEXT_CHARS
+    
+    async def fake_analyze(text, include_explanations=True):
+        analyzed.append(text)
+        raise RuntimeError("stop after capturing the text")
+    
+    monkeypatch.setattr(enhanced_main, "fetch_url_text", fake_fetch)
+    monkeypatch.setattr(enhanced_main, "analyze_news_text", fake_analyze)
+    response = TestClient(enhanced_main.app).post("/analyze", json={"url": "https://example.com/a"})
+    assert response.status_code == 500
+    assert len(analyzed[0]) == enhanced_main.MAX_TEXT_CHARS
+
+
+def test_url_text_revalidated_with_etag(tmp_path, monkeypatch):
+    from collections import OrderedDict
+    
+    import httpx
+    
+    monkeypatch.setattr(enhanced_main, "URL_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(enhanced_main, "_url_cache", OrderedDict())
+    page = b"<html><body><article>Officials said the bridge reopened.</article></body></html>"
+    seen_headers = []
+    
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        if request.url.path == "/plain":
+            return httpx.Response(200, content=page)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=page, headers={"ETag": '"v1"'})
+    
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            texts = [await enhanced_main.fetch_url_text(client, "https://example.com/a")]
+            texts.append(await enhanced_main.fetch_url_text(client, "https://example.com/a"))
+            # Drop the in-memory entry; the on-disk copy still allows revalidation
+            enhanced_main._url_cache.clear()
+            texts.append(await enhanced_main.fetch_url_text(client, "https://example.com/a"))
+            # Pages without validators are not cached
+            await enhanced_main.fetch_url_text(client, "https://example.com/plain")
+            await enhanced_main.fetch_url_text(client, "https://example.com/plain")
+            return texts
+    
+    texts = asyncio.run(run())
+    assert texts == ["Officials said the bridge reopened."] * 3
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert seen_headers[2]["if-none-match"] == '"v1"'
+    assert "if-none-match" not in seen_headers[4]
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_importing_the_server_loads_no_model():
+    # Spawned dataset workers re-import the server as __mp_main__, so the import must stay model-free
+    check = (
+        "import sentence_transformers, transformers\n"
+        "loads = []\n"
+        "transformers.pipeline = lambda *args, **kwargs: loads.append(args)\n"
+        "sentence_transformers.SentenceTransformer = lambda *args, **kwargs: loads.append(args)\n"
+        "import enhanced_main\n"
+        "assert loads == [], loads\n"
+    )
+    subprocess.run([sys.executable, "-c", check], cwd=Path(enhanced_main.__file__).parent, check=True)
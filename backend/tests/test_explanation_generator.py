@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from explanation_generator import USE_AI_EXPLANATIONS, NewsExplanationGenerator
+
+
+def _entities(text):
+    return NewsExplanationGenerator()._extract_key_entities(text)['entities']
+
+
+def test_entities_keep_accented_names():
+    assert _entities("José Martínez met Angela Merkel in Zürich") == [
+        'José Martínez', 'Martínez', 'Angela Merkel', 'Merkel', 'Zürich'
+    ]
+    assert _entities("Renée Côté spoke") == ['Renée Côté', 'Côté']
+
+
+def test_entities_keep_abbreviations_and_limit_to_five():
+    assert _entities("The U.S. Senate met") == ['The U.S. Senate', 'U.S. Senate', 'Senate']
+    assert len(_entities("Alpha Beta Gamma Delta Epsilon Zeta Theta")) == 5
+
+
+def test_ai_explanations_default_off():
+    if "EXPLANATION_USE_AI" in os.environ:
+        pytest.skip("EXPLANATION_USE_AI is set explicitly")
+    assert USE_AI_EXPLANATIONS is False
+
+
+def test_generated_texts_cached_per_instance():
+    generator = NewsExplanationGenerator()
+    generator._text_generator = object()
+    generator._models_loaded = True
+    calls = []
+    
+    def run(prompt_items):
+        calls.append(prompt_items)
+        return tuple((key, f"generated for {prompt}") for key, prompt in prompt_items)
+    
+    generator._run_text_generator = run
+    prompts = {'neutral': "Provide neutral background context for this news: x"}
+    first = generator._generate_ai_texts(prompts)
+    assert generator._generate_ai_texts(dict(prompts)) == first
+    assert len(calls) == 1
+    # A second generator does not share the first one's cache
+    other = NewsExplanationGenerator()
+    other._text_generator, other._models_loaded, other._run_text_generator = object(), True, run
+    other._generate_ai_texts(prompts)
+    assert len(calls) == 2
+
+
+def test_negative_aspects_list_concerns_in_group_order():
+    generator = NewsExplanationGenerator()
+    text = "Officials warn inflation and debt follow the war and the emergency"
+    entities = generator._extract_key_entities(text)
+    assert entities['concerns'] == ['safety', 'violence', 'economic']
+    negative = generator._generate_negative_aspects(text, entities, "REAL", {})
+    assert negative == (
+        "Potential concerns: This news may involve serious public safety concerns, "
+        "and involves conflict or violence that affects communities, "
+        "and may have negative economic implications."
+    )
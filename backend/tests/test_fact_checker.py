@@ -0,0 +1,131 @@
+import random
+import re
+
+import pytest
+
+from fact_checker import CITATION_RE, DATE_PATTERNS, DETAIL_RE, URL_RE, run_enhanced_forensic_checks
+
+# Fragments covering dates, times, amounts, URLs, citations, capitals and punctuation
+FRAGMENTS = [
+    "today", "Yesterday", "todays", "january 5", "March 12", "may 1st", "2023", "2031", "12023",
+    "3/4/2024", "13/13/2029", "10:30", "1:05pm", "$40", "$", "25%", "%", "according to", "Sources say",
+    "reported by", "as per", "https://example.com/a?b=1", "http://x.y", "https:/bad", "NASA", "FBI",
+    "U.S.A.", "COVID-19", "ÉTÉ", "naïve", "ALL-CAPS!", "shocking", "You won't believe", "breaking",
+    "the", "a", "news", "!", "?", ".", "...", "\n", "\t",
+]
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = rng.choices(FRAGMENTS, k=rng.randint(0, 60))
+        texts.append("".join(part + rng.choice([" ", "", ". ", "  "]) for part in parts))
+    return texts
+
+
+ORIGINAL_DATE_PATTERNS = [
+    r'\b(today|yesterday)\b',
+    r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}\b',
+    r'\b202[0-9]\b',
+    r'\b\d{1,2}/\d{1,2}/202[0-9]\b'
+]
+
+
+@pytest.mark.parametrize("compiled, original", [
+    (URL_RE, r'https?://\S+'),
+    (CITATION_RE, r'according to|sources say|reported by|as per'),
+    (DETAIL_RE, r'\b\d{1,2}:\d{2}\b|\b\d{1,2}/\d{1,2}/\d{4}\b|\$\d+|\d+%'),
+])
+def test_forensic_patterns_match_original(compiled, original):
+    for text in random_texts(500):
+        for candidate in (text, text.lower()):
+            assert compiled.findall(candidate) == re.findall(original, candidate)
+
+
+def test_date_patterns_match_original():
+    assert [pattern.pattern for pattern in DATE_PATTERNS] == ORIGINAL_DATE_PATTERNS
+    for text in random_texts(500):
+        text_lower = text.lower()
+        assert (any(pattern.search(text_lower) for pattern in DATE_PATTERNS) ==
+                any(re.search(pattern, text_lower) for pattern in ORIGINAL_DATE_PATTERNS))
+
+
+def original_forensic_checks(text):
+    """run_enhanced_forensic_checks as written before its regex and counting rewrites"""
+    words = text.split()
+    sentences = [s.strip() for s in text.split('.') if s.strip()]
+    num_words = len(words)
+    num_chars = len(text)
+    num_sentences = len(sentences)
+    sensational_keywords = {
+        'clickbait': ['shocking', 'unbelievable', 'amazing', 'incredible', 'mind-blowing',
+                      'you won\'t believe', 'what happened next', 'secret revealed'],
+        'emotional': ['outrage', 'fury', 'scandal', 'bombshell', 'explosive', 'devastating'],
+        'urgency': ['breaking', 'urgent', 'alert', 'emergency', 'crisis', 'immediate'],
+        'superlatives': ['best', 'worst', 'never', 'always', 'everyone', 'nobody', 'all']
+    }
+    text_lower = text.lower()
+    detected_keywords = {category: [kw for kw in keywords if kw in text_lower]
+                         for category, keywords in sensational_keywords.items()}
+    uppercase_words = [w for w in words if len(w) > 3 and w.isupper()]
+    exclamation_count = text.count('!')
+    question_count = text.count('?')
+    caps_ratio = sum(1 for c in text if c.isupper()) / max(num_chars, 1)
+    avg_sentence_length = num_words / max(num_sentences, 1)
+    has_quotes = '"' in text or "'" in text
+    urls = re.findall(r'https?://\S+', text)
+    source_citations = len(re.findall(r'according to|sources say|reported by|as per', text_lower))
+    specific_details = len(re.findall(r'\b\d{1,2}:\d{2}\b|\b\d{1,2}/\d{1,2}/\d{4}\b|\$\d+|\d+%', text))
+    red_flags = []
+    if exclamation_count > 3:
+        red_flags.append("excessive_exclamations")
+    if caps_ratio > 0.15:
+        red_flags.append("excessive_capitals")
+    if len(detected_keywords['clickbait']) > 0:
+        red_flags.append("clickbait_language")
+    if avg_sentence_length > 30:
+        red_flags.append("overly_long_sentences")
+    if source_citations == 0 and num_words > 50:
+        red_flags.append("no_source_attribution")
+    credibility_score = 0.8
+    credibility_score -= len(red_flags) * 0.1
+    if source_citations > 0:
+        credibility_score += 0.1
+    if specific_details > 0:
+        credibility_score += 0.1
+    if has_quotes:
+        credibility_score += 0.05
+    credibility_score = max(0.0, min(1.0, credibility_score))
+    return {
+        'basic_metrics': {
+            'character_count': num_chars,
+            'word_count': num_words,
+            'sentence_count': num_sentences,
+            'avg_sentence_length': round(avg_sentence_length, 1)
+        },
+        'linguistic_analysis': {
+            'uppercase_ratio': round(caps_ratio, 3),
+            'exclamation_count': exclamation_count,
+            'question_count': question_count,
+            'uppercase_words': uppercase_words[:5],
+            'has_quotes': has_quotes
+        },
+        'content_analysis': {
+            'sensational_keywords': detected_keywords,
+            'source_citations': source_citations,
+            'specific_details': specific_details,
+            'urls_found': len(urls)
+        },
+        'credibility_assessment': {
+            'red_flags': red_flags,
+            'credibility_score': round(credibility_score, 3),
+            'assessment': 'high' if credibility_score > 0.7 else 'medium' if credibility_score > 0.4 else 'low'
+        }
+    }
+
+
+def test_forensic_checks_match_original():
+    # Mixes short texts (direct counting) with long ones (histogram path), ASCII and not
+    for text in random_texts(1500, seed=2) + ["", "ÉTÉ NAÏVE ALL-CAPS", "A" * 200]:
+        assert run_enhanced_forensic_checks(text) == original_forensic_checks(text), text
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from inference_pipeline import ClassificationBatcher, FakeNewsInferencePipeline
+
+
+class RecordingClassifier:
+    """Batch classifier stand-in that records each batch and fails on texts marked 'bad'"""
+    
+    def __init__(self):
+        self.batches = []
+    
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        if any(text.startswith("bad") for text in texts):
+            raise ValueError("bad input")
+        return [f"label:{text}" for text in texts]
+
+
+def test_batcher_coalesces_concurrent_requests():
+    classifier = RecordingClassifier()
+    batcher = ClassificationBatcher(classifier, max_batch=4, max_wait=0.05)
+    
+    async def run():
+        return await asyncio.gather(*(batcher.classify(f"text {i}") for i in range(6)))
+    
+    assert asyncio.run(run()) == [f"label:text {i}" for i in range(6)]
+    assert [len(batch) for batch in classifier.batches] == [4, 2]
+
+
+def test_batcher_failure_only_fails_the_bad_input():
+    classifier = RecordingClassifier()
+    batcher = ClassificationBatcher(classifier, max_batch=8, max_wait=0.05)
+    
+    async def run():
+        return await asyncio.gather(batcher.classify("good 1"), batcher.classify("bad 2"),
+                                    batcher.classify("good 3"), return_exceptions=True)
+    
+    good_1, bad_2, good_3 = asyncio.run(run())
+    assert (good_1, good_3) == ("label:good 1", "label:good 3")
+    assert isinstance(bad_2, ValueError)
+    # One failed batch, then each text on its own
+    assert classifier.batches == [["good 1", "bad 2", "good 3"], ["good 1"], ["bad 2"], ["good 3"]]
+
+
+class FakeTextClassifier:
+    """Stands in for the transformers pipeline: one prediction per text, every call recorded"""
+    
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+    
+    def __call__(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [{'label': 'REAL', 'score': 0.9} for _ in texts]
+
+
+@pytest.fixture
+def make_pipeline(monkeypatch):
+    monkeypatch.setattr(FakeNewsInferencePipeline, "load_ml_model", lambda self: None)
+    
+    def make(classifier):
+        inference = FakeNewsInferencePipeline()
+        inference.ml_pipeline = classifier
+        return inference
+    return make
+
+
+def test_identical_concurrent_texts_share_one_classification(make_pipeline):
+    classifier = FakeTextClassifier()
+    inference = make_pipeline(classifier)
+    
+    async def run():
+        return await asyncio.gather(*(inference.run_ml_classification_batched(text)
+                                      for text in ["same"] * 5 + ["other"]))
+    
+    results = asyncio.run(run())
+    assert all(result['label'] == 'REAL' and result['confidence'] == 0.9 for result in results)
+    assert sorted(text for call in classifier.calls for text in call) == ["other", "same"]
+    assert inference._pending_ml == {}
+
+
+def test_results_are_cached_as_copies(make_pipeline):
+    classifier = FakeTextClassifier()
+    inference = make_pipeline(classifier)
+    
+    first = asyncio.run(inference.run_ml_classification_batched("story"))
+    first['label'] = 'MUTATED'
+    second = asyncio.run(inference.run_ml_classification_batched("story"))
+    assert second['label'] == 'REAL'
+    assert classifier.calls == [["story"]]
+
+
+def test_errors_are_not_cached(make_pipeline):
+    classifier = FakeTextClassifier(fail=True)
+    inference = make_pipeline(classifier)
+    
+    failed = asyncio.run(inference.run_ml_classification_batched("story"))
+    assert failed['label'] == 'UNKNOWN'
+    
+    classifier.fail = False
+    assert asyncio.run(inference.run_ml_classification_batched("story"))['label'] == 'REAL'
+    # Batch attempt plus single retry on failure, then one fresh call
+    assert classifier.calls == [["story"], ["story"], ["story"]]
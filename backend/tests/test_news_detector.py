@@ -0,0 +1,150 @@
+import random
+import re
+
+import pytest
+
+from news_detector import NEWS_KEYWORDS, NewsDetector
+
+NEWS_LABELS = ["news article", "headline", "breaking news", "casual conversation", "random text", "advertisement"]
+
+CHAT_TEXT = "hello there my friend how are you"
+NEWS_TEXT = "The president said officials reported new policy in Washington on Monday 2024."
+UNDECIDED_TEXT = "Officials said the report is ready"
+
+
+class FakeZeroShot:
+    """Zero-shot stand-in giving every text the same news score, recording what it saw"""
+    
+    def __init__(self, news_score=0.9):
+        self.news_score = news_score
+        self.seen = []
+    
+    def __call__(self, texts, candidate_labels, **kwargs):
+        self.seen.extend(texts)
+        scores = [self.news_score / 3] * 3 + [(1 - self.news_score) / 3] * 3
+        return [{'labels': NEWS_LABELS, 'scores': scores} for _ in texts]
+
+
+@pytest.fixture
+def detector():
+    detector = NewsDetector()
+    detector.text_classifier = FakeZeroShot()
+    return detector
+
+
+@pytest.mark.parametrize("text, is_news", [(NEWS_TEXT, True), (CHAT_TEXT, False)])
+def test_decisive_rule_score_skips_model(detector, text, is_news):
+    detection = detector.detect_news(text)
+    rule_based_score = detection['features']['rule_based_score']
+    
+    assert detector.text_classifier.seen == []
+    assert detection['is_news'] is is_news
+    assert detection['features']['ai_skipped'] is True
+    assert detection['features']['ai_score'] is None
+    assert detection['confidence'] == rule_based_score
+
+
+def test_undecided_rule_score_runs_model(detector):
+    detection = detector.detect_news(UNDECIDED_TEXT)
+    rule_based_score = detection['features']['rule_based_score']
+    
+    assert detector.text_classifier.seen == [UNDECIDED_TEXT]
+    assert detection['features']['ai_skipped'] is False
+    assert detection['features']['ai_score'] == 0.9
+    assert detection['confidence'] == round(0.7 * rule_based_score + 0.3 * 0.9, 3)
+
+
+def test_skipped_outcome_holds_for_any_ai_score(detector):
+    for text in (NEWS_TEXT, CHAT_TEXT, UNDECIDED_TEXT):
+        for threshold in (0.3, 0.5, 0.6, 0.8):
+            detection = detector.detect_news(text, threshold)
+            if not detection['features']['ai_skipped']:
+                continue
+            features = detector._extract_linguistic_features(text)
+            rule_based_score = detector._calculate_news_probability(text, features)
+            for ai_score in (0.0, 1.0):
+                full = detector._build_detection(features, rule_based_score, ai_score, threshold)
+                assert detection['is_news'] is full['is_news']
+
+
+# Fragments mixing keywords (also inside longer words), years, "City, Region"
+# locations, quotes, title-case and accented words, and odd whitespace
+FRAGMENTS = [
+    "said", "Said", "SAID", "reported", "unsaid", "justice", "nowhere", "statement", "courtship",
+    "President", "officials", "The", "a", "of", "news", "Police", "Zürich", "José", "ÉTÉ",
+    "2024", "1999", "20245", "x2024", "1800", "Paris, France", "Paris,France", "paris, France",
+    "New York,  Texas", '"quoted"', "it's", ".", "...", ". .", "!", "\n", "\t", "  ", "U.S.",
+    "hello", "Hi", "I", "İstanbul", "what's", "How", "you",
+]
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = rng.choices(FRAGMENTS, k=rng.randint(1, 40))
+        texts.append("".join(part + rng.choice([" ", "", "  ", ". "]) for part in parts))
+    return texts
+
+
+def original_features(text):
+    """Feature extraction as written before the keyword automaton and precompiled patterns"""
+    words = text.split()
+    sentences = text.split('.')
+    text_lower = text.lower()
+    category_counts = {
+        category: sum(1 for keyword in keywords if keyword in text_lower)
+        for category, keywords in NEWS_KEYWORDS.items()
+    }
+    return {
+        'word_count': len(words),
+        'sentence_count': max(1, len([s for s in sentences if s.strip()])),
+        'avg_words_per_sentence': len(words) / max(1, len(sentences)),
+        'news_keyword_categories': category_counts,
+        'total_news_keywords': sum(category_counts.values()),
+        'has_quotes': '"' in text or "'" in text,
+        'has_timestamps': bool(re.search(r'\b(20\d{2}|19\d{2})\b', text)),
+        'has_locations': bool(re.search(r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b', text)),
+        'title_case_ratio': sum(1 for w in words if w.istitle()) / max(len(words), 1)
+    }
+
+
+def test_features_match_original_patterns():
+    detector = NewsDetector()
+    for text in random_texts(2000):
+        assert detector._extract_linguistic_features(text) == original_features(text), text
+
+
+def test_headline_check_matches_full_lowercasing():
+    detector = NewsDetector()
+    conversational = ('hi', 'hello', 'i', 'you', 'what', 'how')
+    for text in random_texts(2000, seed=1):
+        words = text.split()
+        expected = (
+            4 <= len(words) <= 25 and
+            any(w.istitle() for w in words) and
+            not text.lower().startswith(conversational)
+        )
+        assert detector.is_news_headline(text) == expected, text
+
+
+def test_repeated_text_reuses_cached_scores_across_thresholds(detector):
+    first = detector.detect_news(UNDECIDED_TEXT, threshold=0.6)
+    first['features']['word_count'] = -1
+    
+    assert detector.detect_news(UNDECIDED_TEXT, threshold=0.6)['features']['word_count'] == 6
+    assert detector.detect_news(UNDECIDED_TEXT, threshold=0.7)['features']['ai_skipped'] is False
+    assert detector.detect_news_batch([UNDECIDED_TEXT, UNDECIDED_TEXT], threshold=0.65)[1]['is_news'] is True
+    assert detector.text_classifier.seen == [UNDECIDED_TEXT]
+
+
+def test_detection_cache_evicts_least_recently_used(detector, monkeypatch):
+    import news_detector
+    
+    monkeypatch.setattr(news_detector, "DETECTION_CACHE_SIZE", 2)
+    texts = [UNDECIDED_TEXT, "Officials said the report is late", "Officials said the report is out"]
+    for text in texts:
+        detector.detect_news(text)
+    detector.detect_news(texts[2])
+    detector.detect_news(texts[0])
+    assert detector.text_classifier.seen == texts + [texts[0]]
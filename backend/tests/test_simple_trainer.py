@@ -0,0 +1,60 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from simple_trainer import MODEL_ARTIFACTS, SimpleNewsTrainer
+
+SAMPLE_TEXTS = [
+    "Scientists publish peer-reviewed study on climate trends",
+    "SHOCKING secret cure doctors don't want you to know!!!",
+    "City council approves budget for new public library",
+]
+
+
+def predictions(trainer):
+    return [(r['predicted_label'], r['fake_probability']) for r in trainer.predict(SAMPLE_TEXTS)]
+
+
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    trainer = SimpleNewsTrainer(model_dir=tmp_path_factory.mktemp("model_out"))
+    trainer.train_model()
+    return trainer
+
+
+@pytest.fixture
+def trained_dir(trained):
+    return trained.model_dir
+
+
+def test_save_writes_compressed_artifacts_and_idf(trained_dir):
+    for name in MODEL_ARTIFACTS:
+        assert (trained_dir / f"{name}.joblib").exists()
+    assert (trained_dir / "idf.npy").exists()
+
+
+def test_round_trip_predicts_identically(trained, trained_dir):
+    loaded = SimpleNewsTrainer(model_dir=trained_dir)
+    assert loaded.load_model()
+    
+    # idf_ is memory-mapped rather than unpickled
+    assert isinstance(loaded.vectorizer[-1].idf_, np.memmap)
+    assert predictions(loaded) == predictions(trained)
+
+
+def test_load_requires_idf(trained_dir, tmp_path):
+    for name in MODEL_ARTIFACTS:
+        (tmp_path / f"{name}.joblib").write_bytes((trained_dir / f"{name}.joblib").read_bytes())
+    
+    assert not SimpleNewsTrainer(model_dir=tmp_path).load_model()
+
+
+def test_legacy_pickles_still_load(trained, tmp_path):
+    for name in MODEL_ARTIFACTS:
+        with open(tmp_path / f"{name}.pkl", 'wb') as f:
+            pickle.dump(getattr(trained, name), f)
+    
+    legacy = SimpleNewsTrainer(model_dir=tmp_path)
+    assert legacy.load_model()
+    assert predictions(legacy) == predictions(trained)